@@ -1,10 +1,13 @@
 # /app/graph/nodes/rag_node.py
 # Node to integrate Hybrid RAG support: contextual documents retrieval
 
+import logging
 from typing import Dict
 from app.graph.state import DecisionState
 from app.rag.vectorstore_manager import get_vectorstore_manager
 
+logger = logging.getLogger(__name__)
+
 def rag_node(state: DecisionState) -> Dict:
     # Retrieve relevant information from persistent vectorstore for Hybrid RAG.
     #
@@ -17,13 +20,11 @@ def rag_node(state: DecisionState) -> Dict:
     #
     # Get persistent vectorstore
     vectorstore_manager = get_vectorstore_manager()
-    vectorstore = vectorstore_manager.get_vectorstore()
     
     # Check if vectorstore has any documents
     try:
-        # Try a test query to check if vectorstore is populated
-        test_results = vectorstore.similarity_search("test", k=1)
-        if not test_results:
+        # Local count: no embedding API round-trip for an empty-store check
+        if vectorstore_manager.count() == 0:
             # Vectorstore is empty
             return {
                 "rag_context": "",
@@ -36,7 +37,7 @@ def rag_node(state: DecisionState) -> Dict:
             }
     except Exception as e:
         # Vectorstore not initialized or empty
-        print(f"[RAG_NODE] ⚠️ Vectorstore check failed: {e}")
+        logger.warning("[RAG_NODE] ⚠️ Vectorstore check failed: %s", e)
         return {
             "rag_context": "",
             "messages": [
@@ -51,22 +52,22 @@ def rag_node(state: DecisionState) -> Dict:
     question = state.get("question", "")
     
     # 🔍 RAG DEBUG - Before retrieval
-    print("\n" + "="*60)
-    print("🔍 RAG DEBUG - RETRIEVAL PHASE")
-    print("="*60)
-    print(f"📝 Question: {question}")
-    print(f"🎯 Retrieving top-5 most relevant chunks from persistent vectorstore...")
+    logger.debug("[RAG_NODE] 🔍 Retrieving top-5 chunks for question: %s", question)
     
-    # Retrieve top 5 relevant chunks from persistent vectorstore
-    retrieved = vectorstore.similarity_search_with_score(question, k=5)
+    # Retrieve 5 relevant chunks: MMR re-ranks the top candidates so that
+    # near-duplicate chunks do not crowd out other evidence
+    retrieved = vectorstore_manager.similarity_search_with_score(
+        question,
+        k=5,
+        fetch_k=vectorstore_manager.RETRIEVAL_FETCH_K
+    )
     
-    # 🔍 RAG DEBUG - After retrieval
-    print(f"✅ Retrieved {len(retrieved)} chunks")
-    for i, (doc, score) in enumerate(retrieved, start=1):
-        preview = doc.page_content[:150].replace('\n', ' ')
-        print(f"\n📄 Chunk {i} (similarity: {score:.4f}, first 150 chars):")
-        print(f"   {preview}...")
-    print("="*60 + "\n")
+    # 🔍 RAG DEBUG - After retrieval (per-chunk previews only when DEBUG is on)
+    logger.debug("[RAG_NODE] ✅ Retrieved %d chunks", len(retrieved))
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, (doc, score) in enumerate(retrieved, start=1):
+            preview = doc.page_content[:150].replace('\n', ' ')
+            logger.debug("[RAG_NODE] 📄 Chunk %d (score: %.4f): %s...", i, score, preview)
     
     # 🆕 Aggregate retrieved chunks with structured cognitive framing
     rag_context = "Use the following chunks in priority order (most relevant first):\n\n"
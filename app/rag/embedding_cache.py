@@ -0,0 +1,198 @@
+# app/rag/embedding_cache.py
+#
+# Persistent embedding cache for RAG chunks.
+# Vectors are stored in SQLite, keyed by (sha256(text), model name), so
+# re-indexing unchanged content never calls the embedding API again.
+
+import sqlite3
+import struct
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+# Required by chromadb, so always installed alongside the vectorstore
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    # Text → embedding vector cache backed by a single SQLite file.
+    #
+    # Features:
+    # - Keyed by (sha256(text), model): switching models never reuses stale vectors
+    # - Vectors stored 8-bit quantized (1 byte per dimension + per-vector offset/scale,
+    #   ~4x smaller than float32); Chroma still receives the full vectors on a miss
+    # - Batch lookups/inserts (one query per batch, not per chunk)
+    # - Bounded in-memory LRU in front of SQLite for chunks seen this session
+    # - Thread-safe: used from the concurrent embedding workers (vectors are
+    #   decoded outside the lock, which only guards SQLite and the LRU)
+
+    # Max host parameters per SQLite query (lookups are split accordingly)
+    QUERY_BATCH = 500
+
+    # In-memory LRU size (vectors held as float32 ndarrays: ~6 KB per 1536-dim
+    # vector → ~30 MB at most; a list of Python floats would take ~50 KB)
+    MAX_MEMORY_ENTRIES = 5000
+
+    # Vector table (8-bit blobs) and tables of earlier versions → their struct format
+    TABLE = "embeddings_q8"
+    LEGACY_TABLES = {"embeddings": "f", "embeddings_f16": "e"}
+
+    # Blob header: per-vector offset (min value) and scale, as little-endian doubles
+    _HEADER = struct.Struct("<dd")
+
+    def __init__(self, db_path: Path, model: str):
+        # Initialize EmbeddingCache (the database is opened on first use).
+        #
+        # Args:
+        #     db_path: SQLite file path
+        #     model: Embedding model name (part of the cache key)
+
+        self.db_path = Path(db_path)
+        self.model = model
+        self._conn = None
+        self._lock = threading.Lock()
+        # sha256 key → float32 vector, least recently used first
+        self._lru: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Open the database and create the table on first use (call with the lock held).
+
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                "text_hash BLOB NOT NULL, model TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (text_hash, model))"
+            )
+            for legacy_table, value_format in self.LEGACY_TABLES.items():
+                self._migrate_legacy_table(legacy_table, value_format)
+            self._conn.commit()
+        return self._conn
+
+    def _migrate_legacy_table(self, table: str, value_format: str):
+        # Convert rows written by earlier versions, then drop their table
+        # (call with the lock held). Keeps already-paid-for vectors out of the API.
+        #
+        # Args:
+        #     table: Legacy table name
+        #     value_format: struct format character of its packed values
+
+        legacy = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not legacy:
+            return
+
+        size = struct.calcsize(value_format)
+        rows = self._conn.execute(f"SELECT text_hash, model, vector FROM {table}")
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {self.TABLE} VALUES (?, ?, ?)",
+            (
+                (text_hash, model, self._pack(struct.unpack(f"<{len(vector) // size}{value_format}", vector)))
+                for text_hash, model, vector in rows
+            )
+        )
+        self._conn.execute(f"DROP TABLE {table}")
+        logger.info("[EMBED_CACHE] ♻️ Migrated %s cache table to 8-bit vectors", table)
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    @classmethod
+    def _pack(cls, vector) -> bytes:
+        # Scalar-quantize to 256 levels between the vector's own min and max
+        # (error at most half a step, ~0.1% of the value range).
+
+        values = np.asarray(vector, dtype=np.float64)
+        low, high = float(values.min()), float(values.max())
+        scale = (high - low) / 255
+        if scale:
+            levels = np.round((values - low) / scale).astype(np.uint8)
+        else:
+            levels = np.zeros(len(values), dtype=np.uint8)
+        return cls._HEADER.pack(low, scale) + levels.tobytes()
+
+    @classmethod
+    def _unpack(cls, blob: bytes) -> np.ndarray:
+        low, scale = cls._HEADER.unpack_from(blob)
+        levels = np.frombuffer(blob, dtype=np.uint8, offset=cls._HEADER.size)
+        return levels.astype(np.float32) * np.float32(scale) + np.float32(low)
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        # Insert/refresh a float32 vector in the LRU, evicting the oldest
+        # entries (call with the lock held)
+
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.MAX_MEMORY_ENTRIES:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        # Look up cached vectors.
+        #
+        # Args:
+        #     texts: Chunk texts
+        #
+        # Returns:
+        #     One vector per text, None for cache misses
+
+        keys = [self._key(text) for text in texts]
+        found = {}
+        blobs = {}
+
+        with self._lock:
+            # Memory first; only the remaining keys go to SQLite
+            for key in keys:
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+
+            pending = list({key for key in keys if key not in found})
+            if pending:
+                conn = self._connection()
+                for start in range(0, len(pending), self.QUERY_BATCH):
+                    batch = pending[start:start + self.QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = conn.execute(
+                        f"SELECT text_hash, vector FROM {self.TABLE} WHERE model = ? AND text_hash IN ({placeholders})",
+                        [self.model, *batch]
+                    )
+                    blobs.update(rows)
+
+        # Decode outside the lock so concurrent workers do not queue behind it
+        if blobs:
+            decoded = {text_hash: self._unpack(blob) for text_hash, blob in blobs.items()}
+            found.update(decoded)
+            with self._lock:
+                for text_hash, vector in decoded.items():
+                    self._remember(text_hash, vector)
+
+        return [found[key].tolist() if key in found else None for key in keys]
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        # Store vectors for texts (existing entries are replaced).
+        #
+        # Args:
+        #     texts: Chunk texts
+        #     vectors: One embedding vector per text, same order
+
+        arrays = [np.asarray(vector, dtype=np.float32) for vector in vectors]
+        rows = [
+            (self._key(text), self.model, self._pack(vector))
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            for (key, _, _), vector in zip(rows, arrays):
+                self._remember(key, vector)
+            conn = self._connection()
+            conn.executemany(f"INSERT OR REPLACE INTO {self.TABLE} VALUES (?, ?, ?)", rows)
+            conn.commit()
@@ -18,20 +18,27 @@
 
 import os
 import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 # Import HF persistence for cloud storage
 try:
     from app.rag.hf_persistence import get_hf_persistence
     from app.rag.vectorstore_manager import get_vectorstore_manager, reset_vectorstore_singleton
     HF_PERSISTENCE_AVAILABLE = True
-    print("[FILE_MANAGER] ✅ HF persistence module imported successfully")
+    logger.info("[FILE_MANAGER] ✅ HF persistence module imported successfully")
 except Exception as e:
     HF_PERSISTENCE_AVAILABLE = False
-    print(f"[FILE_MANAGER] ⚠️ HF persistence not available: {e}")
-    print("[FILE_MANAGER] Using local storage only")
+    logger.warning("[FILE_MANAGER] ⚠️ HF persistence not available: %s", e)
+    logger.warning("[FILE_MANAGER] Using local storage only")
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -39,10 +46,56 @@ RAG_STORAGE_DIR = PROJECT_ROOT / "data" / "uploaded_rag"
 
 try:
     RAG_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-    print(f"[FILE_MANAGER] RAG Storage Directory: {RAG_STORAGE_DIR}")
+    logger.info("[FILE_MANAGER] RAG Storage Directory: %s", RAG_STORAGE_DIR)
 except Exception as e:
-    print(f"[FILE_MANAGER] ⚠️ Warning: Could not create RAG storage directory: {e}")
-    print(f"[FILE_MANAGER] RAG Storage Directory (not writable): {RAG_STORAGE_DIR}")
+    logger.warning("[FILE_MANAGER] ⚠️ Warning: Could not create RAG storage directory: %s", e)
+    logger.warning("[FILE_MANAGER] RAG Storage Directory (not writable): %s", RAG_STORAGE_DIR)
+
+
+# Number of leading bytes inspected to detect binary uploads
+BINARY_SNIFF_BYTES = 512
+
+# Worker threads used to overlap disk I/O (copies, reads) in batch uploads
+UPLOAD_IO_WORKERS = 8
+
+# Uploads up to this size are read once and kept in memory for embedding;
+# larger ones are streamed to storage and re-read only if needed
+IN_MEMORY_COPY_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class FileEntry:
+    #
+    # One stored RAG file in FileManager state.
+    # Slotted: no per-entry __dict__, so large file lists stay compact.
+    #
+    name: str
+    path: str
+    size: int
+    modified: str
+    timestamp: float
+    duplicate_of: Optional[str] = None
+    
+    @property
+    def size_kb(self) -> float:
+        return round(self.size / 1024, 2)
+
+
+# (file metadata dict, self._files entry, content bytes if kept in memory)
+StoredFile = Tuple[Dict[str, str], FileEntry, Optional[bytes]]
+
+
+def _looks_binary(data: bytes) -> bool:
+    #
+    # Quick magic-byte sniff: text documents never contain NUL bytes.
+    #
+    # Args:
+    #     data: Raw file content (only the first BINARY_SNIFF_BYTES are inspected)
+    #
+    # Returns:
+    #     True if the content looks binary
+    #
+    return b'\x00' in data[:BINARY_SNIFF_BYTES]
 
 
 class FileManager:
@@ -66,210 +119,249 @@ class FileManager:
         #     storage_dir: Directory for file storage (defaults to project data/uploaded_rag/)
         #
         self.storage_dir = storage_dir
-        self._files: List[Dict[str, str]] = []
+        # Pre-stringified storage dir for cheap os.path operations in hot loops
+        self._storage_dir_str = str(storage_dir)
+        self._files: List[FileEntry] = []
+        
+        # Rendered views of self._files, rebuilt only after the list changes.
+        # Reads run concurrently with uploads: a view is stored only if no
+        # invalidation happened while it was being built (generation check).
+        self._render_cache: Optional[str] = None
+        self._storage_info_cache: Optional[Dict] = None
+        self._render_generation = 0
+        self._render_lock = threading.Lock()
+        
+        # Names of files already uploaded to HF Hub during this session
+        self._uploaded_hub = set()
+        
+        # Content hash → stored name of the first embedded copy (dedup table)
+        self._content_hash_to_name: Dict[str, str] = {}
         
         # Try to initialize HF persistence
         try:
             self.hf_persistence = get_hf_persistence() if HF_PERSISTENCE_AVAILABLE else None
             if self.hf_persistence:
-                print("[FILE_MANAGER] ✅ HF persistence instance created")
+                logger.info("[FILE_MANAGER] ✅ HF persistence instance created")
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Could not create HF persistence: {e}")
+            logger.warning("[FILE_MANAGER] ⚠️ Could not create HF persistence: %s", e)
             self.hf_persistence = None
         
         try:
             # On HF Spaces, load from HF Hub instead of local filesystem
             if self.hf_persistence:
-                print("[FILE_MANAGER] 🌐 Using HF Hub for storage")
+                logger.info("[FILE_MANAGER] 🌐 Using HF Hub for storage")
                 self._load_from_hf_hub()
             else:
                 # Fallback to local filesystem (development mode)
-                print("[FILE_MANAGER] 💾 Using local filesystem for storage")
+                logger.info("[FILE_MANAGER] 💾 Using local filesystem for storage")
                 self.storage_dir.mkdir(parents=True, exist_ok=True)
                 self.refresh_state()
             
-            print(f"[FILE_MANAGER] 🏗️ FileManager initialized with {len(self._files)} file(s)")
+            logger.info("[FILE_MANAGER] 🏗️ FileManager initialized with %d file(s)", len(self._files))
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Warning during initialization: {e}")
-            import traceback
-            traceback.print_exc()
-            print(f"[FILE_MANAGER] 🏗️ FileManager initialized with 0 file(s) (filesystem access limited)")
+            logger.exception("[FILE_MANAGER] ⚠️ Warning during initialization: %s", e)
+            logger.warning("[FILE_MANAGER] 🏗️ FileManager initialized with 0 file(s) (filesystem access limited)")
     
     def _load_from_hf_hub(self):
         #
         # Load file registry from HF Hub (for HF Spaces deployment)
         #
-        print(f"\n[FILE_MANAGER] 📥 Loading file registry from HF Hub...")
+        logger.debug("[FILE_MANAGER] 📥 Loading file registry from HF Hub...")
         
         try:
             if not self.hf_persistence:
-                print(f"[FILE_MANAGER] ⚠️ HF persistence not available")
+                logger.warning("[FILE_MANAGER] ⚠️ HF persistence not available")
                 self._files = []
                 return
             
             registry = self.hf_persistence.load_registry()
             
-            print(f"[FILE_MANAGER] 📊 Registry contains {len(registry)} entries")
-            if registry:
-                for i, doc in enumerate(registry):
-                    print(f"[FILE_MANAGER]   Entry {i+1}: {doc.get('filename', 'NO FILENAME')} uploaded at {doc.get('uploaded_at', 'N/A')}")
+            logger.debug("[FILE_MANAGER] 📊 Registry contains %d entries", len(registry))
             
             # Convert registry format to internal _files format
             self._files = [
-                {
-                    "name": doc.get("filename", "unknown"),
-                    "path": doc.get("source", ""),
-                    "size": 0,  # Size not tracked in registry
-                    "size_kb": 0.0,
-                    "modified": doc.get("uploaded_at", "N/A"),
-                    "timestamp": 0  # Timestamp not tracked
-                }
+                FileEntry(
+                    name=doc.get("filename", "unknown"),
+                    path=doc.get("source", ""),
+                    size=0,  # Size not tracked in registry
+                    modified=doc.get("uploaded_at", "N/A"),
+                    timestamp=0  # Timestamp not tracked
+                )
                 for doc in registry
                 if doc and isinstance(doc, dict) and "filename" in doc
             ]
             
-            print(f"[FILE_MANAGER] ✅ Loaded {len(self._files)} file(s) from HF Hub")
-            if self._files:
-                for i, f in enumerate(self._files):
-                    print(f"[FILE_MANAGER]   File {i+1}: {f.get('name', 'unknown')}")
+            logger.info("[FILE_MANAGER] ✅ Loaded %d file(s) from HF Hub", len(self._files))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[FILE_MANAGER] Files: %s", [f.name for f in self._files])
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Error loading from HF Hub: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[FILE_MANAGER] ⚠️ Error loading from HF Hub: %s", e)
             self._files = []
+        finally:
+            self._invalidate_render_cache()
     
     def sync_files_to_vectorstore(self):
         #
         # Sync all files: registry to HF Hub, files to HF Hub, then embed to vectorstore.
         # This is called separately from upload to avoid blocking Gradio's event loop.
         #
-        print(f"[FILE_MANAGER] 🔄 Starting full sync...")
+        logger.info("[FILE_MANAGER] 🔄 Starting full sync...")
         
         if not self._files:
-            print(f"[FILE_MANAGER] ℹ️ No files to sync")
+            logger.info("[FILE_MANAGER] ℹ️ No files to sync")
             return
         
-        # Step 1: Sync local files to HF Hub registry
+        # Step 1: Sync local files to HF Hub registry and upload files not yet
+        # on HF Hub (deferred upload), all in a single commit
         if self.hf_persistence:
-            print(f"[FILE_MANAGER] 📤 Syncing registry to HF Hub...")
-            registry = self.hf_persistence.load_registry()
-            registry_filenames = {doc.get("filename") for doc in registry}
-            
-            # Add any local files not yet in registry
-            for file_info in self._files:
-                if file_info['name'] not in registry_filenames:
-                    print(f"[FILE_MANAGER] ➕ Adding {file_info['name']} to registry...")
-                    self.hf_persistence.add_document_to_registry_only(
-                        filename=file_info['name'],
-                        source=file_info['path']
-                    )
+            logger.debug("[FILE_MANAGER] 📤 Syncing registry and files to HF Hub...")
+            self.hf_persistence.add_documents_bulk(
+                [(file_info.name, file_info.path) for file_info in self._files]
+            )
+            self._sync_uploads(self._files)
         
         # Step 2: Embed files to vectorstore
-        print(f"[FILE_MANAGER] 🔄 Embedding files to vectorstore...")
+        self._sync_embeddings(self._files)
+    
+    def _sync_uploads(self, files: List[FileEntry]):
+        #
+        # Upload local files not uploaded yet, plus pending registry changes,
+        # to HF Hub in one commit.
+        #
+        # Args:
+        #     files: List of file entries from internal state
+        #
+        pending = []
+        for file_info in files:
+            name = file_info.name
+            file_path = os.path.join(self._storage_dir_str, name)
+            if name not in self._uploaded_hub and os.path.exists(file_path):
+                pending.append((name, file_path))
+        
+        logger.debug("[FILE_MANAGER] 📤 Uploading %d file(s) to HF Hub (deferred from upload)...", len(pending))
+        if self.hf_persistence.upload_documents_with_registry(pending):
+            self._uploaded_hub.update(name for name, _ in pending)
+    
+    def _sync_embeddings(self, files: List[FileEntry]):
+        #
+        # Embed files into the vectorstore, downloading them from HF Hub if missing locally.
+        #
+        # Args:
+        #     files: List of file entries from internal state
+        #
+        logger.debug("[FILE_MANAGER] 🔄 Embedding files to vectorstore...")
         try:
             vectorstore_manager = get_vectorstore_manager()
             
-            for file_info in self._files:
-                file_path = self.storage_dir / file_info['name']
-                
-                # Ensure file exists locally (download from HF Hub if needed)
-                if not file_path.exists():
-                    if self.hf_persistence:
-                        print(f"[FILE_MANAGER] 📥 Downloading {file_info['name']} from HF Hub...")
-                        if not self.hf_persistence.download_document(file_info['name'], str(file_path)):
-                            print(f"[FILE_MANAGER] ⚠️ File not on HF Hub yet, will upload now...")
-                            # File not on HF Hub yet (deferred upload), skip for now
-                            # It will be uploaded in next iteration
-                            continue
-                    else:
-                        print(f"[FILE_MANAGER] ⚠️ File not found and HF persistence unavailable: {file_info['name']}")
-                        continue
-                else:
-                    # File exists locally, upload to HF Hub if not already there (deferred upload)
-                    if self.hf_persistence:
-                        print(f"[FILE_MANAGER] 📤 Uploading {file_info['name']} to HF Hub (deferred from upload)...")
-                        self.hf_persistence.upload_document_file(file_info['name'], str(file_path))
-                
-                try:
-                    print(f"[FILE_MANAGER] 📖 Reading {file_info['name']}...")
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    print(f"[FILE_MANAGER] 📊 Content length: {len(content)} chars")
-                    
-                    if len(content) == 0:
-                        print(f"[FILE_MANAGER] ⚠️ Empty file: {file_info['name']}")
-                        continue
-                    
-                    print(f"[FILE_MANAGER] ➕ Adding to vectorstore...")
-                    chunks_added = vectorstore_manager.add_documents(
-                        documents=[content],
-                        metadatas=[{
-                            'filename': file_info['name'],
-                            'timestamp': file_info.get('modified', 'N/A')
-                        }]
-                    )
-                    print(f"[FILE_MANAGER] ✅ Added {file_info['name']}: {chunks_added} chunks")
-                
-                except Exception as e:
-                    print(f"[FILE_MANAGER] ⚠️ Failed to sync {file_info['name']}: {e}")
-                    import traceback
-                    traceback.print_exc()
+            # Load all files first (in parallel: downloads and reads are I/O-bound),
+            # then one add_documents call embeds them in batches
+            documents = []
+            metadatas = []
             
-            print(f"[FILE_MANAGER] ✅ Vectorstore sync complete")
+            for file_info, content in zip(files, self._map_io(self._load_sync_content, files)):
+                if content is None:
+                    continue
+                documents.append(content)
+                metadatas.append({
+                    'filename': file_info.name,
+                    'timestamp': file_info.modified
+                })
+            
+            chunks_added = vectorstore_manager.add_documents(documents=documents, metadatas=metadatas)
+            
+            logger.info("[FILE_MANAGER] ✅ Vectorstore sync complete: %d file(s), %d chunks", len(documents), chunks_added)
+        
+        except Exception as e:
+            logger.exception("[FILE_MANAGER] ❌ Vectorstore sync failed: %s", e)
+    
+    def _load_sync_content(self, file_info: FileEntry) -> Optional[str]:
+        #
+        # Load a file's text for embedding, downloading it from HF Hub if missing locally.
+        # Runs in worker threads: problems are logged, never raised.
+        #
+        # Args:
+        #     file_info: Entry from internal state
+        #
+        # Returns:
+        #     File content, or None if the file is unavailable, empty or unreadable
+        #
+        file_path = os.path.join(self._storage_dir_str, file_info.name)
+        
+        # Ensure file exists locally (download from HF Hub if needed)
+        if not os.path.exists(file_path):
+            if self.hf_persistence:
+                logger.debug("[FILE_MANAGER] 📥 Downloading %s from HF Hub...", file_info.name)
+                if not self.hf_persistence.download_document(file_info.name, file_path):
+                    # File not on HF Hub yet (deferred upload), skip for now
+                    logger.warning("[FILE_MANAGER] ⚠️ File not on HF Hub yet: %s", file_info.name)
+                    return None
+            else:
+                logger.warning("[FILE_MANAGER] ⚠️ File not found and HF persistence unavailable: %s", file_info.name)
+                return None
         
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read().decode('utf-8')
         except Exception as e:
-            print(f"[FILE_MANAGER] ❌ Vectorstore sync failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[FILE_MANAGER] ⚠️ Failed to read %s: %s", file_info.name, e)
+            return None
+        
+        if len(content) == 0:
+            logger.warning("[FILE_MANAGER] ⚠️ Empty file: %s", file_info.name)
+            return None
+        
+        return content
     
-    def refresh_state(self) -> List[Dict[str, str]]:
+    def refresh_state(self) -> List[FileEntry]:
         #
         # Reload file list from disk or HF Hub and update internal state.
         #
         # Returns:
         #     Updated list of files
         #
-        print(f"\n[FILE_MANAGER] 🔄 refresh_state() called")
-        
-        self._files = []
+        logger.debug("[FILE_MANAGER] 🔄 refresh_state() called")
         
         # On HF Spaces, load from HF Hub
         if self.hf_persistence:
             self._load_from_hf_hub()
             return self._files
         
-        # Fallback to local filesystem (development mode)
+        # Fallback to local filesystem (development mode); the list is built
+        # aside and swapped in whole, so readers never see a partial scan
+        files = []
         try:
             if not self.storage_dir.exists():
-                print(f"[FILE_MANAGER] ⚠️ Storage directory does not exist: {self.storage_dir}")
-                return self._files
-            
-            for file_path in self.storage_dir.iterdir():
-                if file_path.is_file() and file_path.name != '.gitkeep':
-                    try:
-                        stat = file_path.stat()
-                        self._files.append({
-                            "name": file_path.name,
-                            "path": str(file_path),
-                            "size": stat.st_size,
-                            "size_kb": round(stat.st_size / 1024, 2),
-                            "modified": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                            "timestamp": stat.st_mtime
-                        })
-                    except Exception as e:
-                        print(f"[FILE_MANAGER] ⚠️ Error reading file {file_path}: {e}")
-            
-            # Sort by modification time (newest first)
-            self._files.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-            
-            print(f"[FILE_MANAGER] 📊 State refreshed: {len(self._files)} file(s)")
+                logger.warning("[FILE_MANAGER] ⚠️ Storage directory does not exist: %s", self.storage_dir)
+            else:
+                # scandir yields the file type from readdir, so only real files get stat'ed
+                with os.scandir(self._storage_dir_str) as entries:
+                    for entry in entries:
+                        if entry.name == '.gitkeep' or not entry.is_file():
+                            continue
+                        try:
+                            stat = entry.stat()
+                            files.append(FileEntry(
+                                name=entry.name,
+                                path=entry.path,
+                                size=stat.st_size,
+                                modified=datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                                timestamp=stat.st_mtime
+                            ))
+                        except Exception as e:
+                            logger.warning("[FILE_MANAGER] ⚠️ Error reading file %s: %s", entry.path, e)
+                
+                # Sort by modification time (newest first)
+                files.sort(key=lambda x: x.timestamp, reverse=True)
+                
+                logger.debug("[FILE_MANAGER] 📊 State refreshed: %d file(s)", len(files))
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Error during refresh_state: {e}")
+            logger.warning("[FILE_MANAGER] ⚠️ Error during refresh_state: %s", e)
         
+        self._files = files
+        self._invalidate_render_cache()
         return self._files
     
-    def get_files(self) -> List[Dict[str, str]]:
+    def get_files(self) -> List[FileEntry]:
         #
         # Get current file list (state).
         #
@@ -286,19 +378,24 @@ class FileManager:
         #     Dict with 'file_count', 'total_size_mb', etc.
         #
         try:
-            if not self._files:
-                total_size = 0
-            else:
-                total_size = sum(f.get("size", 0) for f in self._files)
+            info = self._storage_info_cache
+            if info is None:
+                generation = self._render_generation
+                files = self._files
+                total_size = sum(f.size for f in files)
+                info = {
+                    "file_count": len(files),
+                    "total_size_bytes": total_size,
+                    "total_size_mb": round(total_size / (1024 * 1024), 2),
+                    "storage_path": str(self.storage_dir.absolute())
+                }
+                with self._render_lock:
+                    if generation == self._render_generation:
+                        self._storage_info_cache = info
             
-            return {
-                "file_count": len(self._files) if self._files else 0,
-                "total_size_bytes": total_size,
-                "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "storage_path": str(self.storage_dir.absolute())
-            }
+            return dict(info)
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Error in get_storage_info: {e}")
+            logger.warning("[FILE_MANAGER] ⚠️ Error in get_storage_info: %s", e)
             return {
                 "file_count": 0,
                 "total_size_bytes": 0,
@@ -315,32 +412,38 @@ class FileManager:
         # Returns:
         #     Formatted text for Gradio Textbox
         #
+        text = self._render_cache
+        if text is not None:
+            return text
+        
         try:
-            print(f"\n[FILE_MANAGER] 📋 render_files_text() called")
-            print(f"[FILE_MANAGER] 📊 Current _files count: {len(self._files)}")
-            
-            if self._files:
-                for i, f in enumerate(self._files):
-                    print(f"[FILE_MANAGER]   {i+1}. {f.get('name', 'unknown')}")
-            
-            if not self._files:
-                print(f"[FILE_MANAGER] ⚠️ No files in state, returning empty message")
+            generation = self._render_generation
+            files = self._files
+            if not files:
                 return "📂 No files uploaded yet"
             
             lines = [
-                f"{i+1}. **{f['name']}** ({f.get('size_kb', 0)} KB) • {f.get('modified', 'N/A')}"
-                for i, f in enumerate(self._files)
+                f"{i+1}. **{f.name}** ({f.size_kb} KB) • {f.modified}"
+                for i, f in enumerate(files)
             ]
             
-            result = "\n".join(lines)
-            print(f"[FILE_MANAGER] ✅ Rendered {len(lines)} file(s) for UI")
-            return result
+            text = "\n".join(lines)
+            with self._render_lock:
+                # Not stored if the list changed while rendering (stale view)
+                if generation == self._render_generation:
+                    self._render_cache = text
+            return text
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Error in render_files_text: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[FILE_MANAGER] ⚠️ Error in render_files_text: %s", e)
             return "⚠️ Error loading file list"
     
+    def _invalidate_render_cache(self):
+        # Drop rendered views; call after every change to self._files
+        with self._render_lock:
+            self._render_generation += 1
+            self._render_cache = None
+            self._storage_info_cache = None
+    
     def render_storage_summary(self) -> str:
         #
         # Pure function: render storage summary.
@@ -355,7 +458,7 @@ class FileManager:
                 f"{info['total_size_mb']} MB"
             )
         except Exception as e:
-            print(f"[FILE_MANAGER] ⚠️ Error in render_storage_summary: {e}")
+            logger.warning("[FILE_MANAGER] ⚠️ Error in render_storage_summary: %s", e)
             return "📊 **Storage:** 0 file(s) • 0.0 MB"
     
     def save_uploaded_file(self, file_path: str) -> Dict[str, str]:
@@ -371,12 +474,96 @@ class FileManager:
         # Raises:
         #     FileNotFoundError: If source file doesn't exist
         #
+        stored = self._store_uploaded_file(file_path)
+        self._embed_stored_files([stored])
+        return stored[0]
+    
+    def save_uploaded_files(self, file_paths: List[str]) -> Tuple[List[Dict[str, str]], List[Tuple[str, Exception]]]:
+        #
+        # Save a batch of uploaded files and embed them with a single vectorstore call.
+        #
+        # Args:
+        #     file_paths: Paths to the temporary uploaded files (from Gradio)
+        #
+        # Returns:
+        #     Tuple of (metadata dicts of saved files, (path, error) pairs of failed files)
+        #
+        stored_files = []
+        failed = []
+        
+        # Copies are I/O-bound: run them in parallel, then update state in input order
+        for file_path, outcome in zip(file_paths, self._map_io(self._try_copy_uploaded_file, file_paths)):
+            if isinstance(outcome, Exception):
+                logger.warning("[FILE_MANAGER] ⚠️ Failed to save %s: %s", file_path, outcome)
+                failed.append((file_path, outcome))
+            else:
+                self._files.append(outcome[1])
+                self._invalidate_render_cache()
+                stored_files.append(outcome)
+        
+        self._embed_stored_files(stored_files)
+        
+        # Record the whole batch in the HF Hub registry with a single save
+        # (one Space commit per batch, not per file; file uploads stay deferred)
+        if self.hf_persistence and stored_files:
+            self.hf_persistence.add_documents_bulk(
+                [(result["stored_name"], result["stored_path"]) for result, _, _ in stored_files]
+            )
+            if not self.hf_persistence.flush_registry():
+                logger.warning("[FILE_MANAGER] ⚠️ Failed to save HF Hub registry for %d upload(s)", len(stored_files))
+        
+        return [result for result, _, _ in stored_files], failed
+    
+    @staticmethod
+    def _map_io(func, items: List) -> List:
+        #
+        # Apply an I/O-bound function to items, in a thread pool when there are several.
+        # Threads overlap disk waits (the GIL is released during syscalls).
+        #
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_IO_WORKERS, len(items))) as executor:
+            return list(executor.map(func, items))
+    
+    def _store_uploaded_file(self, file_path: str) -> StoredFile:
+        #
+        # Copy an uploaded file to permanent storage and add it to local state.
+        #
+        # Args:
+        #     file_path: Path to the temporary uploaded file (from Gradio)
+        #
+        # Returns:
+        #     Tuple of (file metadata dict, entry added to self._files, content bytes or None)
+        #
+        # Raises:
+        #     FileNotFoundError: If source file doesn't exist
+        #
+        stored = self._copy_uploaded_file(file_path)
+        self._files.append(stored[1])
+        self._invalidate_render_cache()
+        return stored
+    
+    def _try_copy_uploaded_file(self, file_path: str):
+        # Worker wrapper: return the exception instead of raising it
+        try:
+            return self._copy_uploaded_file(file_path)
+        except Exception as e:
+            return e
+    
+    def _copy_uploaded_file(self, file_path: str) -> StoredFile:
+        #
+        # Copy an uploaded file to permanent storage (thread-safe: no shared state).
+        #
+        # Returns:
+        #     Tuple of (file metadata dict, entry for self._files, content bytes or None)
+        #
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Source file not found: {file_path}")
         
         # Extract original filename
         original_name = Path(file_path).name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         
         # Create unique filename: originalname_timestamp.ext
         name_parts = original_name.rsplit('.', 1)
@@ -388,69 +575,148 @@ class FileManager:
         
         stored_path = self.storage_dir / stored_name
         
-        # Copy file to permanent storage
-        shutil.copy2(file_path, stored_path)
+        # Read small uploads once: the same bytes are written to storage and
+        # embedded, so the stored copy is never read back.
+        # Large ones are streamed (sendfile fast path on Linux).
+        # File metadata is not copied: "modified" is the upload time anyway.
+        size = os.path.getsize(file_path)
+        if size <= IN_MEMORY_COPY_MAX_BYTES:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            with open(stored_path, 'wb') as f:
+                f.write(data)
+            size = len(data)
+        else:
+            data = None
+            shutil.copyfile(file_path, stored_path)
+        
+        logger.info("[FILE_MANAGER] ✅ Saved: %s → %s", original_name, stored_name)
+        
+        file_entry = FileEntry(
+            name=stored_name,
+            path=str(stored_path),
+            size=size,
+            modified=now.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=now.timestamp()
+        )
+        
+        result = {
+            "original_name": original_name,
+            "stored_path": str(stored_path),
+            "stored_name": stored_name,
+            "timestamp": timestamp
+        }
+        
+        return result, file_entry, data
+    
+    def _read_stored_bytes(self, stored: StoredFile):
+        #
+        # Get a stored file's raw bytes (runs in worker threads, no shared state).
+        # Content kept from the copy is reused; otherwise the stored file is read.
+        #
+        # Returns:
+        #     File bytes, None for empty files, or the exception raised by the read
+        #
+        result, file_entry, data = stored
+        if file_entry.size == 0:
+            return None
+        if data is not None:
+            return data
+        try:
+            with open(result["stored_path"], 'rb') as f:
+                return f.read()
+        except Exception as e:
+            return e
+    
+    def _embeddable_content(self, result: Dict[str, str], file_entry: FileEntry, data: Optional[bytes]) -> Optional[str]:
+        #
+        # Validate a stored file's bytes for embedding, skipping unusable or duplicate content.
+        # Registers the content hash in the dedup table when the file is accepted.
+        #
+        # Args:
+        #     result: File metadata dict from _store_uploaded_file
+        #     file_entry: Matching entry in self._files
+        #     data: File bytes from _read_stored_bytes (None for empty files)
+        #
+        # Returns:
+        #     File content, or None if the file must not be embedded
+        #
+        stored_name = result["stored_name"]
+        
+        # Skip embedding for content the vectorstore can't use
+        if data is None:
+            logger.warning("[FILE_MANAGER] ⚠️ Empty file, skipping embedding: %s", stored_name)
+            return None
         
-        print(f"✅ [FILE_MANAGER] Saved: {original_name} → {stored_name}")
+        if _looks_binary(data):
+            logger.warning("[FILE_MANAGER] ⚠️ Binary file, skipping embedding: %s", stored_name)
+            return None
+        
+        content = data.decode('utf-8')
+        
+        # Identical content already embedded under another name: point at it
+        content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        original = self._content_hash_to_name.get(content_hash)
+        if original is not None:
+            file_entry.duplicate_of = original
+            logger.info("[FILE_MANAGER] ♻️ Duplicate of %s, skipping embedding: %s", original, stored_name)
+            return None
+        
+        self._content_hash_to_name[content_hash] = stored_name
+        return content
+    
+    def _embed_stored_files(self, stored_files: List[StoredFile]):
+        #
+        # Embed stored files in the local vectorstore with one add_documents call.
+        # Embedding failures are logged: files stay saved but are NOT available for RAG.
+        #
+        # Args:
+        #     stored_files: (file metadata dict, self._files entry, content bytes) tuples
+        #
+        documents = []
+        metadatas = []
         
-        # Add to local state immediately
-        self._files.append({
-            "name": stored_name,
-            "path": str(stored_path),
-            "size": os.path.getsize(stored_path),
-            "size_kb": round(os.path.getsize(stored_path) / 1024, 2),
-            "modified": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "timestamp": datetime.now().timestamp()
-        })
+        # Reads overlap in threads; validation and dedup stay sequential (input order)
+        for (result, file_entry, _), data in zip(stored_files, self._map_io(self._read_stored_bytes, stored_files)):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                content = self._embeddable_content(result, file_entry, data)
+            except Exception as e:
+                logger.warning("[FILE_MANAGER] ⚠️ Could not read %s: %s", result["stored_name"], e)
+                continue
+            
+            if content is not None:
+                documents.append(content)
+                metadatas.append({
+                    "filename": result["stored_name"],
+                    "original_name": result["original_name"],
+                    "uploaded_at": result["timestamp"]
+                })
         
-        print(f"[FILE_MANAGER] 📝 File added to local state")
+        if not documents:
+            return
         
-        # Embed file in vectorstore immediately (local only, no HF Hub sync)
         try:
             from app.rag.vectorstore_manager import get_vectorstore_manager
             vectorstore_manager = get_vectorstore_manager()
             
-            print(f"[FILE_MANAGER] 🔄 Embedding file in local vectorstore...")
-            print(f"[FILE_MANAGER] 📍 File path: {stored_path}")
-            print(f"[FILE_MANAGER] 📊 File exists: {stored_path.exists()}")
-            print(f"[FILE_MANAGER] 📏 File size: {stored_path.stat().st_size} bytes")
-            
-            # Read file content
-            with open(stored_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            print(f"[FILE_MANAGER] 📖 Read {len(content)} chars from file")
-            
-            # Add to vectorstore with metadata
-            metadata = {
-                "filename": stored_name,
-                "original_name": original_name,
-                "uploaded_at": timestamp
-            }
-            
             # Add to local vectorstore WITHOUT syncing to HF Hub (prevents restart)
             chunk_count = vectorstore_manager.add_documents(
-                [content], 
-                [metadata],
+                documents,
+                metadatas,
                 sync_to_hub=False  # ← Critical: prevents restart loop!
             )
             
-            print(f"[FILE_MANAGER] ✅ File embedded! {chunk_count} chunks added to vectorstore")
-            print(f"[FILE_MANAGER] 🎉 File ready for RAG!")
-            print(f"[FILE_MANAGER] 💡 Vectorstore saved locally, will sync to HF Hub on next app restart")
+            logger.info("[FILE_MANAGER] ✅ %d file(s) embedded! %d chunks added to vectorstore", len(documents), chunk_count)
         except Exception as e:
-            import traceback
-            print(f"[FILE_MANAGER] ❌ Failed to embed file!")
-            print(f"[FILE_MANAGER] Error: {e}")
-            print(f"[FILE_MANAGER] Traceback:\n{traceback.format_exc()}")
-            print(f"[FILE_MANAGER] 💡 File saved but NOT available for RAG")
-        
-        return {
-            "original_name": original_name,
-            "stored_path": str(stored_path),
-            "stored_name": stored_name,
-            "timestamp": timestamp
-        }
+            # Forget hashes of content that never made it into the vectorstore
+            embedded_names = {metadata["filename"] for metadata in metadatas}
+            self._content_hash_to_name = {
+                h: name for h, name in self._content_hash_to_name.items()
+                if name not in embedded_names
+            }
+            logger.exception("[FILE_MANAGER] ❌ Failed to embed files (saved but NOT available for RAG): %s", e)
     
     def read_file_content(self, file_path: str) -> str:
         #
@@ -477,11 +743,11 @@ class FileManager:
         
         for file_info in self._files:
             try:
-                content = self.read_file_content(file_info["path"])
+                content = self.read_file_content(file_info.path)
                 if content.strip():
                     contents.append(content)
             except Exception as e:
-                print(f"⚠️ [FILE_MANAGER] Error reading {file_info['name']}: {e}")
+                logger.warning("[FILE_MANAGER] ⚠️ Error reading %s: %s", file_info.name, e)
                 continue
         
         return contents
@@ -497,15 +763,15 @@ class FileManager:
         #     True if deleted successfully
         #
         
-        file_path = self.storage_dir / file_name
+        file_path = os.path.join(self._storage_dir_str, file_name)
         
-        if file_path.exists() and file_path.is_file():
-            file_path.unlink()
-            print(f"🗑️ [FILE_MANAGER] Deleted: {file_name}")
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+            logger.info("[FILE_MANAGER] 🗑️ Deleted: %s", file_name)
             self.refresh_state()
             return True
         else:
-            print(f"⚠️ [FILE_MANAGER] File not found: {file_name}")
+            logger.warning("[FILE_MANAGER] ⚠️ File not found: %s", file_name)
             return False
     
     def clear_all_files(self) -> int:
@@ -518,32 +784,34 @@ class FileManager:
         #
         count = 0
         
-        for file_path in self.storage_dir.iterdir():
-            if file_path.is_file() and file_path.name != '.gitkeep':
-                file_path.unlink()
-                count += 1
+        with os.scandir(self._storage_dir_str) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name != '.gitkeep':
+                    os.remove(entry.path)
+                    count += 1
         
-        print(f"🗑️ [FILE_MANAGER] Cleared {count} file(s)")
+        logger.info("[FILE_MANAGER] 🗑️ Cleared %d file(s)", count)
+        self._content_hash_to_name.clear()
         
         # Clear vectorstore
         try:
             vectorstore_manager = get_vectorstore_manager()
             vectorstore_manager.clear()
-            print(f"✅ [FILE_MANAGER] Vectorstore cleared")
+            logger.info("[FILE_MANAGER] ✅ Vectorstore cleared")
             
             # Reset singleton to ensure fresh initialization on next use
             reset_vectorstore_singleton()
-            print(f"✅ [FILE_MANAGER] Vectorstore singleton reset")
+            logger.debug("[FILE_MANAGER] ✅ Vectorstore singleton reset")
         except Exception as e:
-            print(f"⚠️ [FILE_MANAGER] Failed to clear vectorstore: {e}")
+            logger.warning("[FILE_MANAGER] ⚠️ Failed to clear vectorstore: %s", e)
         
         # Clear HF Hub registry
         if self.hf_persistence:
             try:
                 self.hf_persistence.clear_registry()
-                print(f"✅ [FILE_MANAGER] HF Hub registry cleared")
+                logger.info("[FILE_MANAGER] ✅ HF Hub registry cleared")
             except Exception as e:
-                print(f"⚠️ [FILE_MANAGER] Failed to clear HF Hub registry: {e}")
+                logger.warning("[FILE_MANAGER] ⚠️ Failed to clear HF Hub registry: %s", e)
         
         self.refresh_state()
         
@@ -552,10 +820,13 @@ class FileManager:
 
 # Singleton instance for global access
 _file_manager_instance = None
+_file_manager_instance_lock = threading.Lock()
 
 def get_file_manager() -> FileManager:
     #
     # Get the singleton FileManager instance.
+    # The first call loads the HF Hub registry; launch_real_ui starts it in the
+    # background, and callers arriving meanwhile wait on the same initialization.
     #
     # Returns:
     #     Global FileManager instance
@@ -563,12 +834,14 @@ def get_file_manager() -> FileManager:
 
     global _file_manager_instance
     if _file_manager_instance is None:
-        _file_manager_instance = FileManager()
+        with _file_manager_instance_lock:
+            if _file_manager_instance is None:
+                _file_manager_instance = FileManager()
     return _file_manager_instance
 
 
 # Legacy functions for backward compatibility (delegate to singleton)
-def load_all_files() -> List[Dict[str, str]]:
+def load_all_files() -> List[FileEntry]:
     # Legacy function - use get_file_manager().get_files() instead.
     
     return get_file_manager().get_files()
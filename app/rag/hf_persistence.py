@@ -4,18 +4,66 @@
 #
 # This module handles persistent storage of:
 # 1. RAG document registry (rag_documents.json)
-# 2. ChromaDB vectorstore (chroma_db.tar.gz)
+# 2. ChromaDB vectorstore (chroma_db/ folder)
 #
 # Storage location: HF Space repository itself (Git-backed)
 
 import os
 import json
+import logging
 import tarfile
-import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from huggingface_hub import HfApi, hf_hub_download, upload_file
+from typing import List, Dict, Optional, Tuple
+from huggingface_hub import (
+    CommitOperationAdd,
+    HfApi,
+    hf_hub_download,
+    snapshot_download,
+    upload_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Prefer orjson for registry (de)serialization (much faster on large registries)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _load_json_file(file_path: str):
+    # Parse a JSON file, using orjson when available
+    #
+    # Args:
+    #     file_path: Path to the JSON file
+    #
+    # Returns:
+    #     Parsed JSON content
+    
+    if ORJSON_AVAILABLE:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+    
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dump_json_bytes(data) -> bytes:
+    # Serialize data to UTF-8 JSON bytes (same layout as the registry file)
+    #
+    # Args:
+    #     data: JSON-serializable data
+    #
+    # Returns:
+    #     Encoded JSON document
+    
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 class HFPersistence:
@@ -28,61 +76,81 @@ class HFPersistence:
     
     # File names in HF Hub repository
     REGISTRY_FILE = "rag_documents.json"
-    CHROMA_ARCHIVE = "chroma_db.tar.gz"
+    CHROMA_REPO_DIR = "chroma_db"  # Vectorstore folder, uploaded file by file
+    CHROMA_ARCHIVE = "chroma_db.tar.gz"  # Legacy single-archive layout (download only)
     
     # Local paths
     PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
     CHROMA_DIR = PROJECT_ROOT / "chroma_db"  # RAG vectorstore (not chroma_memory)
     
+    # Seconds an in-memory registry copy is served without asking the Hub
+    REGISTRY_CACHE_TTL = 30.0
+    
     def __init__(self):
+        # Fingerprint of chroma_db at the last successful upload
+        self._last_sync_fingerprint = None
+        
+        # In-memory registry cache (filled by load_registry / save_registry)
+        self._registry_cache: Optional[List[Dict]] = None
+        self._registry_cache_ts = 0.0
+        # Filenames in the cached registry, for O(1) duplicate checks
+        self._filenames = set()
+        # True when the in-memory registry has changes not yet saved to HF Hub
+        self._registry_dirty = False
+        
         try:
             self.api = HfApi()
-            print(f"[HF_PERSISTENCE] ✅ Initialized for {self.HF_USERNAME}/{self.HF_REPO}")
-            print(f"[HF_PERSISTENCE] Token available: {bool(self.HF_TOKEN)}")
+            logger.info("[HF_PERSISTENCE] ✅ Initialized for %s/%s", self.HF_USERNAME, self.HF_REPO)
+            logger.debug("[HF_PERSISTENCE] Token available: %s", bool(self.HF_TOKEN))
         except Exception as e:
-            print(f"[HF_PERSISTENCE] ⚠️ Error initializing HfApi: {e}")
+            logger.warning("[HF_PERSISTENCE] ⚠️ Error initializing HfApi: %s", e)
             self.api = None
     
     # ============ RAG DOCUMENT REGISTRY ============
     
-    def load_registry(self) -> List[Dict]:
+    def load_registry(self, force_refresh: bool = False) -> List[Dict]:
         # Load RAG document registry from HF Hub
+        # Served from memory for REGISTRY_CACHE_TTL seconds; after that the HF
+        # cache is revalidated (the file is only re-downloaded if it changed).
+        # Unsaved in-memory changes (see add_documents_bulk) always win.
+        #
+        # Args:
+        #     force_refresh: Ignore the in-memory cache
         #
         # Returns:
         #     List of document metadata dictionaries
         
-        print(f"\n{'='*60}")
-        print(f"📥 Loading RAG document registry from HF Hub...")
+        if self._registry_dirty or (not force_refresh and self._registry_cache_valid()):
+            return list(self._registry_cache)
+        
+        logger.debug("[HF_PERSISTENCE] 📥 Loading RAG document registry from HF Hub...")
         
         # Check if HfApi is available
         if not self.api:
-            print("⚠️ HfApi not initialized, returning empty registry")
-            print(f"{'='*60}\n")
+            logger.warning("[HF_PERSISTENCE] ⚠️ HfApi not initialized, returning empty registry")
             return []
         
         try:
-            # Force download from server, not cache
+            # Cache-first: HF cache is reused unless the remote file changed
             file_path = hf_hub_download(
                 repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
                 filename=self.REGISTRY_FILE,
                 repo_type="space",
                 token=self.HF_TOKEN,
-                force_download=True,  # Bypass local cache
             )
             
-            with open(file_path, "r", encoding="utf-8") as f:
-                registry = json.load(f)
-                print(f"✅ Loaded RAG document registry: {len(registry)} files")
-                print(f"{'='*60}\n")
-            return registry
+            registry = _load_json_file(file_path)
+            self._set_registry_cache(registry)
+            logger.debug("[HF_PERSISTENCE] ✅ Loaded RAG document registry: %s files", len(registry))
+            return list(registry)
             
         except Exception as e:
             # If file doesn't exist or other error, return empty list
             if "404" in str(e) or "Entry Not Found" in str(e):
-                print("📭 No existing RAG document registry found, starting fresh")
+                logger.debug("[HF_PERSISTENCE] 📭 No existing RAG document registry found, starting fresh")
+                self._set_registry_cache([])
             else:
-                print(f"⚠️ Could not load RAG registry: {e}")
-            print(f"{'='*60}\n")
+                logger.warning("[HF_PERSISTENCE] ⚠️ Could not load RAG registry: %s", e)
             return []
     
     def save_registry(self, registry: List[Dict]) -> bool:
@@ -94,21 +162,16 @@ class HFPersistence:
         # Returns:
         #     True if successful, False otherwise
         
-        print(f"\n{'='*60}")
-        print(f"☁️ Saving RAG document registry to HF Hub...")
-        print(f"📊 Registry to save: {len(registry)} documents")
-        for i, doc in enumerate(registry):
-            print(f"   {i+1}. {doc.get('filename', 'NO FILENAME')}")
+        logger.debug("[HF_PERSISTENCE] ☁️ Saving RAG document registry to HF Hub...")
+        logger.debug("[HF_PERSISTENCE] 📊 Registry to save: %s documents", len(registry))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, doc in enumerate(registry):
+                logger.debug("[HF_PERSISTENCE]    %s. %s", i+1, doc.get('filename', 'NO FILENAME'))
         
         try:
-            # Save to temp file first
-            temp_file = os.path.join(tempfile.gettempdir(), self.REGISTRY_FILE)
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(registry, f, ensure_ascii=False, indent=2)
-            
-            # Upload to HF Hub
+            # Upload serialized registry straight from memory (no temp file)
             upload_file(
-                path_or_fileobj=temp_file,
+                path_or_fileobj=_dump_json_bytes(registry),
                 path_in_repo=self.REGISTRY_FILE,
                 repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
                 repo_type="space",
@@ -116,19 +179,81 @@ class HFPersistence:
                 commit_message=f"Update RAG registry: {len(registry)} documents",
             )
             
-            print(f"✅ Saved RAG document registry: {len(registry)} files")
-            print(f"{'='*60}\n")
-            
-            # Cleanup temp file
-            os.remove(temp_file)
+            logger.info("[HF_PERSISTENCE] ✅ Saved RAG document registry: %s files", len(registry))
             
+            self._set_registry_cache(registry)
+            self._registry_dirty = False
             return True
             
         except Exception as e:
-            print(f"❌ Failed to save RAG registry to HF Hub: {e}")
-            print(f"{'='*60}\n")
+            logger.error("[HF_PERSISTENCE] ❌ Failed to save RAG registry to HF Hub: %s", e)
             return False
     
+    def _set_registry_cache(self, registry: List[Dict]):
+        # Remember the latest known registry content
+        #
+        # Args:
+        #     registry: List of document metadata dictionaries
+        
+        self._registry_cache = list(registry)
+        self._registry_cache_ts = time.monotonic()
+        self._filenames = {doc.get("filename") for doc in self._registry_cache}
+    
+    def _registry_cache_valid(self) -> bool:
+        # True if the in-memory registry is younger than REGISTRY_CACHE_TTL
+        
+        return (
+            self._registry_cache is not None
+            and time.monotonic() - self._registry_cache_ts < self.REGISTRY_CACHE_TTL
+        )
+    
+    def add_documents_bulk(self, documents: List[Tuple[str, str]]) -> int:
+        # Add documents to the in-memory registry WITHOUT saving it
+        # Call flush_registry() once the batch is complete.
+        #
+        # Args:
+        #     documents: List of (filename, source path) tuples
+        #
+        # Returns:
+        #     Number of documents actually added (already known ones are skipped)
+        
+        # Reload only when the cache is stale; adds then update it in place
+        if not (self._registry_dirty or self._registry_cache_valid()):
+            self.load_registry()
+        if self._registry_cache is None:
+            self._set_registry_cache([])
+        
+        uploaded_at = datetime.now().isoformat()
+        added = 0
+        
+        for filename, source in documents:
+            if filename in self._filenames:
+                continue
+            self._filenames.add(filename)
+            self._registry_cache.append({
+                "filename": filename,
+                "uploaded_at": uploaded_at,
+                "source": source
+            })
+            added += 1
+        
+        if added:
+            self._registry_cache_ts = time.monotonic()
+            self._registry_dirty = True
+        
+        return added
+    
+    def flush_registry(self) -> bool:
+        # Save the in-memory registry to HF Hub if it has unsaved changes
+        #
+        # Returns:
+        #     True if successful (or nothing to save), False otherwise
+        
+        if not self._registry_dirty:
+            return True
+        
+        return self.save_registry(self._registry_cache)
+    
     def add_document_to_registry_only(self, filename: str, source: str) -> bool:
         # Add a document to the registry WITHOUT uploading file
         # Used during refresh to sync local state with HF Hub
@@ -140,22 +265,11 @@ class HFPersistence:
         # Returns:
         #     True if successful, False otherwise
         
-        registry = self.load_registry()
-        
-        # Check if already exists
-        if any(doc["filename"] == filename for doc in registry):
-            print(f"ℹ️ Document {filename} already in registry")
+        if not self.add_documents_bulk([(filename, source)]):
+            logger.debug("[HF_PERSISTENCE] ℹ️ Document %s already in registry", filename)
             return True
         
-        # Add to registry
-        registry.append({
-            "filename": filename,
-            "uploaded_at": datetime.now().isoformat(),
-            "source": source
-        })
-        
-        # Save registry
-        return self.save_registry(registry)
+        return self.flush_registry()
     
     def add_document(self, filename: str, source: str) -> bool:
         # Add a document to the registry AND upload file to HF Hub
@@ -167,33 +281,88 @@ class HFPersistence:
         # Returns:
         #     True if successful, False otherwise
         
-        registry = self.load_registry()
-        
-        # Check if already exists
-        if any(doc["filename"] == filename for doc in registry):
-            print(f"⚠️ Document {filename} already in registry")
-            return True
-        
         # CRITICAL: Add to registry FIRST (before file upload)
         # This ensures registry is saved even if file upload fails
-        registry.append({
-            "filename": filename,
-            "uploaded_at": datetime.now().isoformat(),
-            "source": source
-        })
+        if not self.add_documents_bulk([(filename, source)]):
+            logger.warning("[HF_PERSISTENCE] ⚠️ Document %s already in registry", filename)
+            return True
         
         # Save registry IMMEDIATELY (this is FAST, single small JSON file)
-        print(f"☁️ Saving registry (file upload deferred to avoid restart)...")
-        registry_saved = self.save_registry(registry)
-        
-        if not registry_saved:
-            print(f"⚠️ Failed to save registry")
+        logger.debug("[HF_PERSISTENCE] ☁️ Saving registry (file upload deferred to avoid restart)...")
+        if not self.flush_registry():
+            logger.warning("[HF_PERSISTENCE] ⚠️ Failed to save registry")
             return False
         
         # NOTE: File upload to HF Hub is DEFERRED to avoid asyncio conflicts
         # The file will be uploaded during refresh/sync operations
         # This makes upload instant and prevents app crashes
-        print(f"💡 File will be synced to HF Hub on next refresh")
+        logger.debug("[HF_PERSISTENCE] 💡 File will be synced to HF Hub on next refresh")
+        
+        return True
+    
+    def commit_many(self, files: List[Tuple], commit_message: str) -> bool:
+        # Upload several files to HF Hub in a single atomic commit
+        # (one Space commit instead of one per file; LFS uploads run in parallel)
+        #
+        # Args:
+        #     files: List of (local path or bytes, path in repo) tuples
+        #     commit_message: Commit message
+        #
+        # Returns:
+        #     True if successful, False otherwise
+        
+        if not self.api:
+            logger.warning("[HF_PERSISTENCE] ⚠️ HF Hub API not initialized")
+            return False
+        
+        operations = [
+            CommitOperationAdd(path_in_repo=path_in_repo, path_or_fileobj=path_or_fileobj)
+            for path_or_fileobj, path_in_repo in files
+        ]
+        
+        try:
+            self.api.create_commit(
+                repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
+                repo_type="space",
+                operations=operations,
+                commit_message=commit_message,
+                token=self.HF_TOKEN,
+            )
+            logger.info("[HF_PERSISTENCE] ✅ Committed %s file(s) to HF Hub", len(operations))
+            return True
+        except Exception as e:
+            logger.error("[HF_PERSISTENCE] ❌ Failed to commit %s file(s) to HF Hub: %s", len(operations), e)
+            return False
+    
+    def upload_documents_with_registry(self, documents: List[Tuple[str, str]]) -> bool:
+        # Upload document files (deferred from add_document) together with the
+        # pending registry changes, in a single commit
+        #
+        # Args:
+        #     documents: List of (filename, source path) tuples
+        #
+        # Returns:
+        #     True if successful (or nothing to upload), False otherwise
+        
+        files = [
+            (source, f"documents/{filename}")
+            for filename, source in documents
+            if os.path.exists(source)
+        ]
+        
+        registry_included = self._registry_dirty
+        if registry_included:
+            files.append((_dump_json_bytes(self._registry_cache), self.REGISTRY_FILE))
+        
+        if not files:
+            return True
+        
+        if not self.commit_many(files, f"Sync RAG documents: {len(documents)} file(s)"):
+            return False
+        
+        if registry_included:
+            self._set_registry_cache(self._registry_cache)
+            self._registry_dirty = False
         
         return True
     
@@ -208,11 +377,11 @@ class HFPersistence:
         #     True if successful, False otherwise
         
         if not os.path.exists(source):
-            print(f"⚠️ Source file not found: {source}")
+            logger.warning("[HF_PERSISTENCE] ⚠️ Source file not found: %s", source)
             return False
         
         try:
-            print(f"☁️ Uploading file {filename} to HF Hub...")
+            logger.debug("[HF_PERSISTENCE] ☁️ Uploading file %s to HF Hub...", filename)
             upload_file(
                 path_or_fileobj=source,
                 path_in_repo=f"documents/{filename}",
@@ -221,10 +390,10 @@ class HFPersistence:
                 token=self.HF_TOKEN,
                 commit_message=f"Add document: {filename}"
             )
-            print(f"✅ File {filename} uploaded to HF Hub")
+            logger.info("[HF_PERSISTENCE] ✅ File %s uploaded to HF Hub", filename)
             return True
         except Exception as e:
-            print(f"⚠️ Failed to upload file {filename} to HF Hub: {e}")
+            logger.warning("[HF_PERSISTENCE] ⚠️ Failed to upload file %s to HF Hub: %s", filename, e)
             return False
     
     def download_document(self, filename: str, local_path: str) -> bool:
@@ -238,11 +407,11 @@ class HFPersistence:
         #     True if successful, False otherwise
         
         if not self.api:
-            print(f"⚠️ HF Hub API not initialized")
+            logger.warning("[HF_PERSISTENCE] ⚠️ HF Hub API not initialized")
             return False
         
         try:
-            print(f"☁️ Downloading {filename} from HF Hub...")
+            logger.debug("[HF_PERSISTENCE] ☁️ Downloading %s from HF Hub...", filename)
             file_path = hf_hub_download(
                 repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
                 filename=f"documents/{filename}",
@@ -254,16 +423,16 @@ class HFPersistence:
             # Copy to desired location
             import shutil
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            shutil.copy2(file_path, local_path)
+            shutil.copyfile(file_path, local_path)
             
-            print(f"✅ Downloaded {filename} to {local_path}")
+            logger.info("[HF_PERSISTENCE] ✅ Downloaded %s to %s", filename, local_path)
             return True
             
         except Exception as e:
             if "404" in str(e) or "Entry Not Found" in str(e):
-                print(f"📭 File {filename} not found on HF Hub")
+                logger.debug("[HF_PERSISTENCE] 📭 File %s not found on HF Hub", filename)
             else:
-                print(f"⚠️ Error downloading {filename}: {e}")
+                logger.warning("[HF_PERSISTENCE] ⚠️ Error downloading %s: %s", filename, e)
             return False
     
     def clear_registry(self) -> bool:
@@ -276,32 +445,8 @@ class HFPersistence:
     
     # ============ CHROMADB VECTORSTORE ============
     
-    def _compress_chroma_dir(self, output_path: str) -> bool:
-        # Compress chroma_db/ directory to .tar.gz
-        #
-        # Args:
-        #     output_path: Path where to save the .tar.gz archive
-        #
-        # Returns:
-        #     True if successful, False otherwise
-        
-        if not self.CHROMA_DIR.exists():
-            print(f"⚠️ Chroma directory not found: {self.CHROMA_DIR}")
-            return False
-        
-        try:
-            with tarfile.open(output_path, "w:gz") as tar:
-                tar.add(str(self.CHROMA_DIR), arcname="chroma_db")
-            
-            size_mb = os.path.getsize(output_path) / (1024 * 1024)
-            print(f"✅ Compressed chroma_db to {output_path} ({size_mb:.2f} MB)")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to compress chroma_db: {e}")
-            return False
-    
     def _extract_chroma_archive(self, archive_path: str) -> bool:
-        # Extract chroma_db.tar.gz to local directory
+        # Extract legacy chroma_db.tar.gz to local directory
         #
         # Args:
         #     archive_path: Path to the .tar.gz archive
@@ -313,62 +458,69 @@ class HFPersistence:
             with tarfile.open(archive_path, "r:gz") as tar:
                 tar.extractall(path=str(self.PROJECT_ROOT))
             
-            print(f"✅ Extracted chroma_db from {archive_path}")
+            logger.info("[HF_PERSISTENCE] ✅ Extracted chroma_db from %s", archive_path)
             return True
         except Exception as e:
-            print(f"❌ Failed to extract chroma_db: {e}")
+            logger.error("[HF_PERSISTENCE] ❌ Failed to extract chroma_db: %s", e)
             return False
     
+    def _chroma_fingerprint(self) -> tuple:
+        # Cheap change detector for chroma_db/: (file count, total size, latest mtime)
+        #
+        # Returns:
+        #     Fingerprint tuple (no file contents are read)
+        
+        count = 0
+        total_size = 0
+        latest_mtime = 0.0
+        for root, _, files in os.walk(self.CHROMA_DIR):
+            for name in files:
+                stat = os.stat(os.path.join(root, name))
+                count += 1
+                total_size += stat.st_size
+                latest_mtime = max(latest_mtime, stat.st_mtime)
+        return count, total_size, latest_mtime
+    
     def upload_vectorstore(self) -> bool:
         # Upload local chroma_db/ to HF Hub
+        # Skipped when chroma_db is unchanged since the last successful upload.
         #
         # Returns:
         #     True if successful, False otherwise
         
-        print(f"\n{'='*60}")
-        print(f"☁️ Uploading vectorstore to HF Hub...")
+        logger.debug("[HF_PERSISTENCE] ☁️ Uploading vectorstore to HF Hub...")
         
         # Check if chroma_db exists locally
         if not self.CHROMA_DIR.exists():
-            print(f"⚠️ No local chroma_db to upload")
-            print(f"{'='*60}\n")
+            logger.warning("[HF_PERSISTENCE] ⚠️ No local chroma_db to upload")
             return False
         
-        # Create temporary archive
-        temp_archive = os.path.join(tempfile.gettempdir(), self.CHROMA_ARCHIVE)
+        fingerprint = self._chroma_fingerprint()
+        if fingerprint == self._last_sync_fingerprint:
+            logger.debug("[HF_PERSISTENCE] ℹ️ Vectorstore unchanged since last upload, skipping")
+            return True
         
         try:
-            # Compress
-            if not self._compress_chroma_dir(temp_archive):
-                return False
-            
-            # Upload to HF Hub
-            upload_file(
-                path_or_fileobj=temp_archive,
-                path_in_repo=self.CHROMA_ARCHIVE,
+            # Upload the folder as-is: the Hub only stores files whose content
+            # changed, so no local archive or full re-upload is needed.
+            # Remote files no longer present locally are deleted.
+            self.api.upload_folder(
+                folder_path=str(self.CHROMA_DIR),
+                path_in_repo=self.CHROMA_REPO_DIR,
                 repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
                 repo_type="space",
                 token=self.HF_TOKEN,
                 commit_message="Update ChromaDB vectorstore",
+                delete_patterns="*",
             )
             
-            size_mb = os.path.getsize(temp_archive) / (1024 * 1024)
-            print(f"✅ Uploaded vectorstore to HF Hub ({size_mb:.2f} MB)")
-            print(f"{'='*60}\n")
-            
-            # Cleanup temp file
-            os.remove(temp_archive)
+            logger.info("[HF_PERSISTENCE] ✅ Uploaded vectorstore to HF Hub (%.2f MB)", fingerprint[1] / (1024 * 1024))
             
+            self._last_sync_fingerprint = fingerprint
             return True
             
         except Exception as e:
-            print(f"❌ Failed to upload vectorstore to HF Hub: {e}")
-            print(f"{'='*60}\n")
-            
-            # Cleanup temp file if exists
-            if os.path.exists(temp_archive):
-                os.remove(temp_archive)
-            
+            logger.error("[HF_PERSISTENCE] ❌ Failed to upload vectorstore to HF Hub: %s", e)
             return False
     
     def download_vectorstore(self) -> bool:
@@ -377,34 +529,49 @@ class HFPersistence:
         # Returns:
         #     True if successful, False otherwise
         
-        print(f"\n{'='*60}")
-        print(f"📥 Downloading vectorstore from HF Hub...")
+        logger.debug("[HF_PERSISTENCE] 📥 Downloading vectorstore from HF Hub...")
         
         try:
-            # Download archive
-            archive_path = hf_hub_download(
+            repo_files = self.api.list_repo_files(
                 repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
-                filename=self.CHROMA_ARCHIVE,
                 repo_type="space",
                 token=self.HF_TOKEN,
-                force_download=True,
             )
             
-            # Extract to local directory
-            success = self._extract_chroma_archive(archive_path)
+            if any(f.startswith(f"{self.CHROMA_REPO_DIR}/") for f in repo_files):
+                # Download the chroma_db/ folder straight into the project root
+                snapshot_download(
+                    repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
+                    repo_type="space",
+                    token=self.HF_TOKEN,
+                    allow_patterns=f"{self.CHROMA_REPO_DIR}/*",
+                    local_dir=str(self.PROJECT_ROOT),
+                )
+                success = True
+            elif self.CHROMA_ARCHIVE in repo_files:
+                # Vectorstore saved by an older version as a single archive
+                archive_path = hf_hub_download(
+                    repo_id=f"{self.HF_USERNAME}/{self.HF_REPO}",
+                    filename=self.CHROMA_ARCHIVE,
+                    repo_type="space",
+                    token=self.HF_TOKEN,
+                    force_download=True,
+                )
+                success = self._extract_chroma_archive(archive_path)
+            else:
+                logger.debug("[HF_PERSISTENCE] 📭 No existing vectorstore found on HF Hub, starting fresh")
+                return False
             
             if success:
-                print(f"✅ Downloaded and extracted vectorstore from HF Hub")
+                logger.info("[HF_PERSISTENCE] ✅ Downloaded vectorstore from HF Hub")
             
-            print(f"{'='*60}\n")
             return success
             
         except Exception as e:
             if "404" in str(e) or "Entry Not Found" in str(e):
-                print("📭 No existing vectorstore found on HF Hub, starting fresh")
+                logger.debug("[HF_PERSISTENCE] 📭 No existing vectorstore found on HF Hub, starting fresh")
             else:
-                print(f"⚠️ Could not download vectorstore: {e}")
-            print(f"{'='*60}\n")
+                logger.warning("[HF_PERSISTENCE] ⚠️ Could not download vectorstore: %s", e)
             return False
     
     def sync_from_hub(self) -> bool:
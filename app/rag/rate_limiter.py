@@ -0,0 +1,53 @@
+# app/rag/rate_limiter.py
+#
+# Sliding-window request rate limiter for the embedding API.
+# Keeps concurrent embedding workers under the account's requests-per-minute
+# quota instead of bursting into HTTP 429 responses.
+
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    # Blocking limiter: at most max_requests acquisitions per period seconds.
+    #
+    # Features:
+    # - Thread-safe: shared by the concurrent embedding workers
+    # - Waits only as long as needed for the oldest request to leave the window
+    # - max_requests <= 0 disables limiting
+
+    def __init__(self, max_requests: int, period: float = 60.0):
+        # Initialize RateLimiter.
+        #
+        # Args:
+        #     max_requests: Requests allowed per period (<= 0: unlimited)
+        #     period: Window length in seconds
+
+        self.max_requests = max_requests
+        self.period = period
+        self._lock = threading.Lock()
+        # Monotonic start times of the requests in the current window, oldest first
+        self._starts = deque()
+
+    def acquire(self):
+        # Block until one more request fits in the window, then record it.
+
+        if self.max_requests <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= self.period:
+                    self._starts.popleft()
+                if len(self._starts) < self.max_requests:
+                    self._starts.append(now)
+                    return
+                wait = self.period - (now - self._starts[0])
+
+            logger.debug("[RATE_LIMITER] ⏳ Request quota reached, waiting %.2fs", wait)
+            time.sleep(wait)
@@ -4,17 +4,52 @@
 # Ensures RAG context is preserved across HF Space restarts.
 
 import os
+import time
+import random
+import functools
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
 from app.rag.hf_persistence import get_hf_persistence
+from app.rag.embedding_cache import EmbeddingCache
+from app.rag.rate_limiter import RateLimiter
 
+# Structure-aware splitters (paragraphs, then sentences, then words); optional.
+# The Rust-native semantic_text_splitter is preferred over the pure-Python LangChain one.
+try:
+    from semantic_text_splitter import TextSplitter
+    SEMANTIC_SPLITTER_AVAILABLE = True
+except ImportError:
+    SEMANTIC_SPLITTER_AVAILABLE = False
 
-# Singleton instance
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    TEXT_SPLITTERS_AVAILABLE = True
+except ImportError:
+    TEXT_SPLITTERS_AVAILABLE = False
+
+# numpy ships with chromadb; embeddings are handed over as one float32 matrix when present
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Singleton instance (created under the lock: the launch preload thread and
+# the first request may ask for it at the same time)
 _vectorstore_instance = None
+_vectorstore_instance_lock = threading.Lock()
 
 
 class VectorstoreManager:
@@ -25,6 +60,48 @@ class VectorstoreManager:
     # - Automatic sync with HF Hub
     # - Lazy loading (creates on first use)
     # - Incremental updates when new files are added
+    # - Debounced HF Hub sync (bursts of adds trigger a single upload)
+    
+    # Quiet period before a requested HF Hub sync actually runs
+    SYNC_DEBOUNCE_SECONDS = 2.0
+    
+    # Chunking (characters): ~500 tokens per chunk keeps embedding calls low
+    CHUNK_SIZE = int(os.getenv("RAG_CHUNK_SIZE", "2000"))
+    CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "200"))
+    # Split points for the LangChain splitter, coarsest first; "" (per character) must stay last
+    CHUNK_SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", "; ", ": ", ", ", " ", ""]
+    
+    # Threads splitting documents in parallel (the native splitter releases the GIL)
+    SPLIT_WORKERS = int(os.getenv("RAG_SPLIT_WORKERS", "4"))
+    
+    # Chunks sent per embedding request (and per Chroma insert)
+    EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "256"))
+    # Embedding requests in flight at once (keep within the OpenAI rate limits)
+    EMBED_CONCURRENCY = int(os.getenv("RAG_EMBED_CONCURRENCY", "4"))
+    # Chunks per collection insert (one SQLite transaction), tuned apart from the embedding
+    # batch; keep it under Chroma's max batch size (~5461 with the default SQLite backend)
+    ADD_BATCH_SIZE = int(os.getenv("RAG_ADD_BATCH_SIZE", "5000"))
+    # Insert precomputed vectors straight into the Chroma collection (False: let
+    # add_texts embed, bypassing the batching/cache/concurrency path)
+    DIRECT_COLLECTION_ADD = True
+    # HNSW index settings, applied when the collection is created (existing ones keep theirs).
+    # "l2" matches the distance-to-similarity conversion in the RAG node; lower M
+    # (e.g. 8) roughly halves index memory for append-only corpora at some recall cost.
+    COLLECTION_METADATA = {
+        "hnsw:space": "l2",
+        "hnsw:M": int(os.getenv("RAG_HNSW_M", "16")),
+        "hnsw:construction_ef": int(os.getenv("RAG_HNSW_CONSTRUCTION_EF", "200")),
+        "hnsw:search_ef": int(os.getenv("RAG_HNSW_SEARCH_EF", "100")),
+    }
+    # Retries of a rate-limited (HTTP 429) embedding request, with exponential backoff
+    # (a longer Retry-After from the API wins)
+    EMBED_MAX_RETRIES = int(os.getenv("OPENAI_RETRY_ATTEMPTS", "3"))
+    EMBED_RETRY_BASE_SECONDS = 1.0
+    # Embedding requests started per minute, across all workers (0: unlimited)
+    EMBED_MAX_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", "3500"))
+    # Candidates fetched per RAG query and re-ranked with MMR for diversity
+    # (0: plain top-k similarity search)
+    RETRIEVAL_FETCH_K = int(os.getenv("RAG_MMR_FETCH_K", "20"))
     
     def __init__(self):
         # Initialize VectorstoreManager.
@@ -33,19 +110,75 @@ class VectorstoreManager:
         self.project_root = Path(__file__).resolve().parent.parent.parent
         self.chroma_dir = self.project_root / "chroma_db"
         self.chroma_dir.mkdir(parents=True, exist_ok=True)
+        # Kept outside chroma_db/ so it is not uploaded with the vectorstore
+        self.embedding_cache_path = self.project_root / "data" / "embedding_cache.sqlite3"
+        
+        # HF persistence, embeddings, embedding cache and text splitter (lazy init, see properties below)
+        self._hf_persistence = None
+        self._embeddings = None
+        self._embedding_cache = None
+        self._splitter = None
         
-        # HF persistence
-        self.hf_persistence = get_hf_persistence()
+        # Shared by the concurrent embedding workers
+        self._rate_limiter = RateLimiter(self.EMBED_MAX_REQUESTS_PER_MINUTE)
         
-        # Vectorstore (lazy init)
+        # Vectorstore (lazy init; the lock lets a background preload and the
+        # first request share one initialization)
         self._vectorstore = None
-        self._embeddings = OpenAIEmbeddings()
+        self._init_lock = threading.Lock()
         
-        # Track indexed files
-        self._indexed_files = set()
+        # blake2b hashes of embedded chunk and document contents (filled when the vectorstore loads)
+        self._chunk_hashes = set()
+        self._doc_hashes = set()
         
-        print(f"[VECTORSTORE] 📦 Initialized")
-        print(f"[VECTORSTORE] 📁 Local dir: {self.chroma_dir}")
+        # Debounced HF Hub sync state
+        self._sync_pending = False
+        self._sync_timer = None
+        self._sync_lock = threading.Lock()
+        
+        logger.debug("[VECTORSTORE] 📦 Initialized")
+        logger.debug("[VECTORSTORE] 📁 Local dir: %s", self.chroma_dir)
+    
+    @property
+    def embeddings(self) -> OpenAIEmbeddings:
+        # OpenAI embeddings client, created on first use.
+        
+        if self._embeddings is None:
+            self._embeddings = get_embeddings()
+        return self._embeddings
+    
+    @property
+    def hf_persistence(self):
+        # HF Hub persistence layer, created on first use.
+        
+        if self._hf_persistence is None:
+            self._hf_persistence = get_hf_persistence()
+        return self._hf_persistence
+    
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        # Persistent embedding cache for the current model, created on first use.
+        
+        if self._embedding_cache is None:
+            model = getattr(self.embeddings, "model", None) or "default"
+            self._embedding_cache = EmbeddingCache(self.embedding_cache_path, str(model))
+        return self._embedding_cache
+    
+    @property
+    def splitter(self):
+        # Text splitter, created once on first use and reused for every document
+        # (None if no splitter library is installed).
+        
+        if self._splitter is None:
+            if SEMANTIC_SPLITTER_AVAILABLE:
+                self._splitter = TextSplitter(self.CHUNK_SIZE, overlap=self.CHUNK_OVERLAP)
+            elif TEXT_SPLITTERS_AVAILABLE:
+                self._splitter = RecursiveCharacterTextSplitter(
+                    chunk_size=self.CHUNK_SIZE,
+                    chunk_overlap=self.CHUNK_OVERLAP,
+                    separators=self.CHUNK_SEPARATORS
+                )
+        return self._splitter
     
     def get_vectorstore(self) -> Chroma:
         # Get or create the persistent vectorstore.
@@ -54,29 +187,57 @@ class VectorstoreManager:
         #     Chroma vectorstore instance
         
         if self._vectorstore is None:
-            self._initialize_vectorstore()
+            with self._init_lock:
+                if self._vectorstore is None:
+                    self._initialize_vectorstore()
         return self._vectorstore
     
     def _initialize_vectorstore(self):
         # Initialize vectorstore with HF Hub sync.
         
-        print(f"\n[VECTORSTORE] 🔧 Initializing...")
+        logger.debug("[VECTORSTORE] 🔧 Initializing...")
         
         # Try to download from HF Hub if available
         if self.hf_persistence and self.hf_persistence.api:
-            print(f"[VECTORSTORE] 📥 Attempting to download from HF Hub...")
+            logger.debug("[VECTORSTORE] 📥 Attempting to download from HF Hub...")
             if self.hf_persistence.download_vectorstore():
-                print(f"[VECTORSTORE] ✅ Loaded from HF Hub")
+                logger.info("[VECTORSTORE] ✅ Loaded from HF Hub")
             else:
-                print(f"[VECTORSTORE] 📭 No existing vectorstore on HF Hub, starting fresh")
+                logger.debug("[VECTORSTORE] 📭 No existing vectorstore on HF Hub, starting fresh")
+        
+        # Create/load persistent vectorstore; published only once the hash sets
+        # are loaded, since get_vectorstore() callers skip the lock when it is set
+        vectorstore = self._open_chroma()
+        self._load_chunk_hashes(vectorstore)
+        self._vectorstore = vectorstore
+        
+        logger.info("[VECTORSTORE] ✅ Vectorstore ready")
+    
+    def _open_chroma(self) -> Chroma:
+        # Open (or create) the persistent Chroma collection with the HNSW settings.
+        # reset_collection() reuses the same metadata when recreating it.
         
-        # Create/load persistent vectorstore
-        self._vectorstore = Chroma(
+        return Chroma(
             persist_directory=str(self.chroma_dir),
-            embedding_function=self._embeddings
+            embedding_function=self.embeddings,
+            collection_metadata=dict(self.COLLECTION_METADATA)
         )
+    
+    def _load_chunk_hashes(self, vectorstore: Chroma):
+        # Rebuild the sets of already embedded chunk and document hashes from stored metadata.
+        #
+        # Args:
+        #     vectorstore: Chroma vectorstore to read the metadata from
         
-        print(f"[VECTORSTORE] ✅ Vectorstore ready")
+        try:
+            existing = vectorstore.get(include=["metadatas"])
+            stored_metadatas = [metadata for metadata in existing.get("metadatas") or [] if metadata]
+            self._chunk_hashes = {m["content_hash"] for m in stored_metadatas if "content_hash" in m}
+            self._doc_hashes = {m["doc_hash"] for m in stored_metadatas if "doc_hash" in m}
+        except Exception as e:
+            logger.warning("[VECTORSTORE] ⚠️ Could not load chunk hashes: %s", e)
+            self._chunk_hashes = set()
+            self._doc_hashes = set()
     
     def add_documents(
         self,
@@ -89,149 +250,510 @@ class VectorstoreManager:
         # Args:
         #     documents: List of document texts
         #     metadatas: Optional list of metadata dicts
-        #     sync_to_hub: Whether to sync to HF Hub immediately (default: False)
+        #     sync_to_hub: Whether to schedule a (debounced) HF Hub sync (default: False)
         # 
         # Returns:
         #     Number of chunks added
         # 
         # Note: By default, sync_to_hub=False to prevent restart loops on HF Spaces.
         #       The vectorstore is persisted locally and can be synced manually later.
+        #       With sync_to_hub=True, consecutive adds are coalesced into one upload
+        #       after SYNC_DEBOUNCE_SECONDS of quiet; call flush() to sync right away.
         
         if not documents:
             return 0
         
         vectorstore = self.get_vectorstore()
+        collection = getattr(vectorstore, "_collection", None) if self.DIRECT_COLLECTION_ADD else None
         
-        # Chunk documents
-        all_chunks = []
-        all_metadatas = []
+        # Chunking is lazy: batches are embedded while later documents are still being split
+        produced = []
+        batches = self._new_chunk_batches(documents, metadatas, produced)
+        stored = 0
+        try:
+            if collection is not None:
+                # A single short document is one chunk: embed it inline, without the thread pool
+                if len(documents) == 1 and len(documents[0]) <= self.CHUNK_SIZE:
+                    embedded = ((batch, self._embed_batch(batch[0])) for batch in batches)
+                else:
+                    embedded = self._embed_batches(batches)
+                
+                # Embedded batches are stored in order, exactly ADD_BATCH_SIZE chunks per insert
+                add_size = self.ADD_BATCH_SIZE
+                pending_chunks, pending_metadatas, pending_vectors = [], [], []
+                for (chunks, chunk_metadatas), embeddings in embedded:
+                    pending_chunks.extend(chunks)
+                    pending_metadatas.extend(chunk_metadatas)
+                    pending_vectors.extend(embeddings)
+                    while len(pending_chunks) >= add_size:
+                        stored += self._add_to_collection(
+                            collection, pending_chunks[:add_size], pending_metadatas[:add_size], pending_vectors[:add_size]
+                        )
+                        del pending_chunks[:add_size], pending_metadatas[:add_size], pending_vectors[:add_size]
+                if pending_chunks:
+                    stored += self._add_to_collection(collection, pending_chunks, pending_metadatas, pending_vectors)
+            else:
+                # Fallback: LangChain embeds each batch itself
+                for chunks, chunk_metadatas in batches:
+                    vectorstore.add_texts(texts=chunks, metadatas=chunk_metadatas)
+                    stored += len(chunks)
+        except Exception:
+            # Forget hashes of chunks that were not stored so a retry embeds them
+            self._chunk_hashes.difference_update(m['content_hash'] for m in produced[stored:])
+            self._doc_hashes.difference_update(m['doc_hash'] for m in produced[stored:])
+            raise
+        
+        if not stored:
+            return 0
         
-        for doc_idx, doc in enumerate(documents):
-            chunks = self._chunk_text(doc)
-            all_chunks.extend(chunks)
-            
-            # Create metadata for each chunk
-            base_metadata = metadatas[doc_idx] if metadatas else {}
-            for chunk_idx in range(len(chunks)):
-                chunk_metadata = {
-                    **base_metadata,
-                    'chunk_id': chunk_idx + 1,
-                    'total_chunks': len(chunks),
-                    'doc_index': doc_idx
-                }
-                all_metadatas.append(chunk_metadata)
-        
-        # Add to vectorstore
-        print(f"[VECTORSTORE] 💾 Adding {len(all_chunks)} chunks to Chroma...")
-        vectorstore.add_texts(texts=all_chunks, metadatas=all_metadatas)
-        
-        print(f"[VECTORSTORE] ✅ Added {len(all_chunks)} chunks from {len(documents)} documents")
+        logger.debug("[VECTORSTORE] ✅ Added %s chunks from %s documents", stored, len(documents))
         
         # Force persist to disk before syncing to HF Hub
-        print(f"[VECTORSTORE] 💾 Persisting to disk...")
+        logger.debug("[VECTORSTORE] 💾 Persisting to disk...")
         try:
             # ChromaDB in newer versions doesn't have explicit persist()
             # The data is automatically persisted when using persist_directory
             pass
         except Exception as e:
-            print(f"[VECTORSTORE] ⚠️ Persist warning: {e}")
+            logger.warning("[VECTORSTORE] ⚠️ Persist warning: %s", e)
         
         # Sync to HF Hub only if requested (to prevent restart loops)
         if sync_to_hub:
-            print(f"[VECTORSTORE] ☁️ Syncing to HF Hub...")
-            self._sync_to_hub()
+            logger.debug("[VECTORSTORE] ☁️ HF Hub sync scheduled")
+            self._schedule_sync()
         else:
-            print(f"[VECTORSTORE] ℹ️ Skipping HF Hub sync (sync_to_hub=False)")
-            print(f"[VECTORSTORE] 💡 Vectorstore saved locally, will sync on next app restart")
+            logger.debug("[VECTORSTORE] ℹ️ Skipping HF Hub sync (sync_to_hub=False)")
+            logger.debug("[VECTORSTORE] 💡 Vectorstore saved locally, will sync on next app restart")
+        
+        return stored
+    
+    def _new_chunk_batches(self, documents: List[str], metadatas: Optional[List[Dict]], produced: List[Dict]):
+        # Split documents into chunks not embedded yet, grouped in EMBED_BATCH_SIZE batches.
+        # 
+        # Args:
+        #     documents: List of document texts
+        #     metadatas: Optional list of metadata dicts (one per document)
+        #     produced: Receives the metadata of every chunk yielded so far
+        # 
+        # Returns:
+        #     Generator of (chunk texts, chunk metadatas) batches
+        
+        chunks_batch = []
+        metadatas_batch = []
+        skipped = 0
+        
+        # Skip whole documents already embedded (no splitting, no chunk hashing)
+        new_docs = []
+        seen = set()
+        for doc_idx, doc in enumerate(documents):
+            doc_hash = hashlib.blake2b(doc.encode('utf-8'), digest_size=16).hexdigest()
+            if doc_hash not in self._doc_hashes and doc_hash not in seen:
+                seen.add(doc_hash)
+                new_docs.append((doc_idx, doc_hash))
+        skipped_docs = len(documents) - len(new_docs)
+        
+        split_docs = self._split_documents([documents[doc_idx] for doc_idx, _ in new_docs])
+        for (doc_idx, doc_hash), chunks in zip(new_docs, split_docs):
+            # Registered only once reached, so a failed add forgets the rest
+            self._doc_hashes.add(doc_hash)
+            
+            # Per-document fields are merged once; each chunk only adds its own two
+            doc_metadata = dict(metadatas[doc_idx]) if metadatas else {}
+            doc_metadata['total_chunks'] = len(chunks)
+            doc_metadata['doc_index'] = doc_idx
+            doc_metadata['doc_hash'] = doc_hash
+            
+            for chunk_idx, chunk in enumerate(chunks):
+                # Skip chunks whose content is already embedded (no OpenAI call)
+                content_hash = hashlib.blake2b(chunk.encode('utf-8'), digest_size=16).hexdigest()
+                if content_hash in self._chunk_hashes:
+                    skipped += 1
+                    continue
+                self._chunk_hashes.add(content_hash)
+                
+                chunk_metadata = {**doc_metadata, 'chunk_id': chunk_idx + 1, 'content_hash': content_hash}
+                produced.append(chunk_metadata)
+                chunks_batch.append(chunk)
+                metadatas_batch.append(chunk_metadata)
+                
+                if len(chunks_batch) == self.EMBED_BATCH_SIZE:
+                    yield chunks_batch, metadatas_batch
+                    chunks_batch, metadatas_batch = [], []
+        
+        if skipped_docs:
+            logger.debug("[VECTORSTORE] ♻️ Skipped %s already embedded documents", skipped_docs)
+        if skipped:
+            logger.debug("[VECTORSTORE] ♻️ Skipped %s already embedded chunks", skipped)
+        
+        if chunks_batch:
+            yield chunks_batch, metadatas_batch
+    
+    def _split_documents(self, texts: List[str]):
+        # Split documents on up to SPLIT_WORKERS threads, yielding results in order.
+        # The splitter is immutable once built, so the threads share it.
+        # 
+        # Args:
+        #     texts: Document texts
+        # 
+        # Returns:
+        #     Generator of chunk lists, one per document
+        
+        if len(texts) < 2 or self.SPLIT_WORKERS <= 1:
+            yield from map(self._split_text, texts)
+            return
+        
+        self.splitter  # build it once before the workers start
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.SPLIT_WORKERS, len(texts)), thread_name_prefix="vectorstore_split"
+        )
+        try:
+            yield from executor.map(self._split_text, texts)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _embed_batches(self, batches):
+        # Embed chunk batches as they are produced, with up to EMBED_CONCURRENCY
+        # requests in flight (pipelined: the caller keeps chunking meanwhile).
+        # Inserts go straight to the collection: add_texts would embed again internally.
+        # 
+        # Args:
+        #     batches: Iterable of (chunk texts, chunk metadatas) batches
+        # 
+        # Returns:
+        #     Generator of (batch, embeddings) pairs, in batch order
+        
+        executor = ThreadPoolExecutor(max_workers=self.EMBED_CONCURRENCY, thread_name_prefix="vectorstore_embed")
+        in_flight = deque()
+        try:
+            for batch in batches:
+                in_flight.append((batch, executor.submit(self._embed_batch, batch[0])))
+                # Bounded pipeline: wait for the oldest batch once the window is full
+                if len(in_flight) > self.EMBED_CONCURRENCY:
+                    batch, future = in_flight.popleft()
+                    yield batch, future.result()
+            while in_flight:
+                batch, future = in_flight.popleft()
+                yield batch, future.result()
+        finally:
+            # On failure, don't start batches nobody will store
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _embed_batch(self, chunks: List[str]) -> List[List[float]]:
+        # Embed one batch, serving cache hits locally and requesting only the misses.
+        # Cache failures are logged and fall through to the embedding API.
+        # 
+        # Args:
+        #     chunks: Chunk texts
+        # 
+        # Returns:
+        #     One embedding vector per chunk
+        
+        try:
+            vectors = self.embedding_cache.get_many(chunks)
+        except Exception as e:
+            logger.warning("[VECTORSTORE] ⚠️ Embedding cache lookup failed: %s", e)
+            vectors = [None] * len(chunks)
+        
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+        
+        missing_chunks = [chunks[i] for i in missing]
+        new_vectors = self._request_embeddings(missing_chunks)
+        for i, vector in zip(missing, new_vectors):
+            vectors[i] = vector
+        
+        try:
+            self.embedding_cache.put_many(missing_chunks, new_vectors)
+        except Exception as e:
+            logger.warning("[VECTORSTORE] ⚠️ Embedding cache update failed: %s", e)
+        
+        return vectors
+    
+    def _add_to_collection(self, collection, chunks: List[str], metadatas: List[Dict], vectors: List[List[float]]) -> int:
+        # Insert embedded chunks into the Chroma collection with a single upsert call.
+        # Ids are the chunk content hashes, so storing the same content again
+        # (e.g. if the hash set could not be loaded) overwrites instead of duplicating.
+        # 
+        # Returns:
+        #     Number of chunks stored
+        
+        collection.upsert(
+            ids=[metadata['content_hash'] for metadata in metadatas],
+            embeddings=self._embedding_matrix(vectors),
+            documents=chunks,
+            metadatas=metadatas
+        )
+        return len(chunks)
+    
+    @staticmethod
+    def _embedding_matrix(vectors: List[List[float]]):
+        # Pack a batch of vectors into one contiguous (N, D) float32 array,
+        # converted once here instead of row by row inside Chroma.
+        # Without numpy, the vectors are passed through unchanged.
+        
+        if not NUMPY_AVAILABLE:
+            return vectors
+        return np.asarray(vectors, dtype=np.float32)
+    
+    def _request_embeddings(self, chunks: List[str]) -> List[List[float]]:
+        # Embed chunks with a single API request, retrying when rate limited (HTTP 429).
+        # 
+        # Args:
+        #     chunks: Chunk texts
+        # 
+        # Returns:
+        #     One embedding vector per chunk
         
-        return len(all_chunks)
+        for attempt in range(self.EMBED_MAX_RETRIES + 1):
+            self._rate_limiter.acquire()
+            try:
+                return self.embeddings.embed_documents(chunks)
+            except Exception as e:
+                rate_limited = getattr(e, "status_code", None) == 429 or "429" in str(e)
+                if not rate_limited or attempt == self.EMBED_MAX_RETRIES:
+                    raise
+                delay = max(self._retry_after_seconds(e), self.EMBED_RETRY_BASE_SECONDS * (2 ** attempt))
+                # Jitter keeps concurrent workers from retrying in lockstep
+                delay += random.uniform(0, self.EMBED_RETRY_BASE_SECONDS)
+                logger.warning("[VECTORSTORE] ⚠️ Embedding rate limited, retrying in %.1fs", delay)
+                time.sleep(delay)
+    
+    @staticmethod
+    def _retry_after_seconds(error: Exception) -> float:
+        # Seconds the API asked us to wait (Retry-After header), 0 if absent.
+        
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return 0.0
     
     def clear(self):
         # Clear all documents from vectorstore.
         
-        print(f"[VECTORSTORE] 🗑️ Clearing vectorstore...")
+        logger.debug("[VECTORSTORE] 🗑️ Clearing vectorstore...")
+        
+        try:
+            # Native delete-and-recreate of the collection: no id scan, and the
+            # open Chroma client keeps a valid database underneath it
+            if self._vectorstore is None:
+                self._vectorstore = self._open_chroma()
+            removed = self._vectorstore._collection.count()
+            self._vectorstore.reset_collection()
+            logger.debug("[VECTORSTORE] 🗑️ Removed %s chunks", removed)
+        except Exception as e:
+            logger.warning("[VECTORSTORE] ⚠️ Collection reset failed, removing directory: %s", e)
+            self._remove_chroma_dir()
+        
+        self._chunk_hashes.clear()
+        self._doc_hashes.clear()
         
-        # Close existing vectorstore connection
-        if self._vectorstore is not None:
+        # Clear on HF Hub
+        if self.hf_persistence and self.hf_persistence.api:
             try:
-                # ChromaDB doesn't have explicit close, just reset reference
-                self._vectorstore = None
+                self.hf_persistence.clear_remote_vectorstore()
+                logger.debug("[VECTORSTORE] ☁️ Cleared from HF Hub")
             except Exception as e:
-                print(f"[VECTORSTORE] ⚠️ Error closing vectorstore: {e}")
+                logger.warning("[VECTORSTORE] ⚠️ Error clearing HF Hub: %s", e)
+        
+        logger.info("[VECTORSTORE] ✅ Cleared")
+    
+    def _remove_chroma_dir(self):
+        # Fallback for clear(): delete chroma_db/ from disk and start an empty vectorstore.
+        
+        # ChromaDB doesn't have explicit close, just reset reference
+        self._vectorstore = None
         
-        # Remove chroma_db directory completely
         import shutil
         if self.chroma_dir.exists():
             try:
                 shutil.rmtree(self.chroma_dir)
-                print(f"[VECTORSTORE] 🗑️ Removed directory: {self.chroma_dir}")
+                logger.debug("[VECTORSTORE] 🗑️ Removed directory: %s", self.chroma_dir)
             except Exception as e:
-                print(f"[VECTORSTORE] ⚠️ Error removing directory: {e}")
+                logger.warning("[VECTORSTORE] ⚠️ Error removing directory: %s", e)
         
         # Recreate empty directory
         self.chroma_dir.mkdir(parents=True, exist_ok=True)
-        print(f"[VECTORSTORE] 📁 Recreated empty directory: {self.chroma_dir}")
+        logger.debug("[VECTORSTORE] 📁 Recreated empty directory: %s", self.chroma_dir)
         
         # Reinitialize empty vectorstore
-        self._vectorstore = Chroma(
-            persist_directory=str(self.chroma_dir),
-            embedding_function=self._embeddings
-        )
-        
-        self._indexed_files.clear()
-        
-        # Clear on HF Hub
-        if self.hf_persistence and self.hf_persistence.api:
-            try:
-                self.hf_persistence.clear_remote_vectorstore()
-                print(f"[VECTORSTORE] ☁️ Cleared from HF Hub")
-            except Exception as e:
-                print(f"[VECTORSTORE] ⚠️ Error clearing HF Hub: {e}")
+        self._vectorstore = self._open_chroma()
+    
+    def count(self) -> int:
+        # Number of stored chunks (local Chroma query, no embedding call).
+        # 
+        # Returns:
+        #     Chunk count
         
-        print(f"[VECTORSTORE] ✅ Cleared")
+        return self.get_vectorstore()._collection.count()
     
     def similarity_search(
         self,
         query: str,
-        k: int = 5
+        k: int = 5,
+        fetch_k: Optional[int] = None,
+        lambda_mult: float = 0.5
     ) -> List[Document]:
         # Search for similar documents.
         # 
         # Args:
         #     query: Search query
         #     k: Number of results to return
+        #     fetch_k: Candidates to re-rank with MMR (None or <= k: plain top-k)
+        #     lambda_mult: MMR trade-off, 1 = pure relevance, 0 = pure diversity
         # 
         # Returns:
         #     List of similar documents
         
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, fetch_k, lambda_mult)]
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        fetch_k: Optional[int] = None,
+        lambda_mult: float = 0.5
+    ) -> List[Tuple[Document, float]]:
+        # Search for similar documents, with their L2 distance to the query.
+        # 
+        # Args:
+        #     query: Search query
+        #     k: Number of results to return
+        #     fetch_k: Candidates to re-rank with MMR (None or <= k: plain top-k)
+        #     lambda_mult: MMR trade-off, 1 = pure relevance, 0 = pure diversity
+        # 
+        # Returns:
+        #     List of (document, distance) pairs, in selection order
+        
         vectorstore = self.get_vectorstore()
-        return vectorstore.similarity_search(query, k=k)
+        if not fetch_k or fetch_k <= k or not NUMPY_AVAILABLE:
+            return vectorstore.similarity_search_with_score(query, k=k)
+        
+        # One native query returns candidates with their stored vectors (no re-embedding)
+        query_vector = self.embeddings.embed_query(query)
+        results = vectorstore._collection.query(
+            query_embeddings=[query_vector],
+            n_results=fetch_k,
+            include=["embeddings", "documents", "metadatas", "distances"]
+        )
+        documents = results["documents"][0]
+        if not documents:
+            return []
+        
+        metadatas = results["metadatas"][0]
+        distances = results["distances"][0]
+        selected = self._mmr_select(query_vector, results["embeddings"][0], k, lambda_mult)
+        return [
+            (Document(page_content=documents[i], metadata=metadatas[i] or {}), distances[i])
+            for i in selected
+        ]
+    
+    @staticmethod
+    def _mmr_select(query_vector: List[float], vectors, k: int, lambda_mult: float) -> List[int]:
+        # Maximal marginal relevance: pick k candidates balancing query similarity
+        # against similarity to the ones already picked. All cosine similarities are
+        # computed once up front; each step is a masked argmax over the candidates.
+        # 
+        # Returns:
+        #     Indices of the selected candidates, in selection order
+        
+        vectors = np.asarray(vectors, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        
+        query_sims = vectors @ query
+        pair_sims = vectors @ vectors.T
+        
+        first = int(np.argmax(query_sims))
+        selected = [first]
+        available = np.ones(len(vectors), dtype=bool)
+        available[first] = False
+        # Highest similarity of each candidate to any selected one
+        redundancy = pair_sims[first].copy()
+        
+        while len(selected) < min(k, len(vectors)):
+            scores = lambda_mult * query_sims - (1 - lambda_mult) * redundancy
+            best = int(np.argmax(np.where(available, scores, -np.inf)))
+            selected.append(best)
+            available[best] = False
+            np.maximum(redundancy, pair_sims[best], out=redundancy)
+        
+        return selected
+    
+    def _schedule_sync(self):
+        # Mark a HF Hub sync as pending and (re)start the debounce timer.
+        
+        with self._sync_lock:
+            self._sync_pending = True
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+            self._sync_timer = threading.Timer(self.SYNC_DEBOUNCE_SECONDS, self.flush)
+            # Non-daemon: on interpreter exit a pending or in-flight upload still
+            # completes instead of being dropped (ingest itself never waits on it)
+            self._sync_timer.daemon = False
+            self._sync_timer.start()
+    
+    def flush(self) -> bool:
+        # Run any pending HF Hub sync now.
+        # 
+        # Returns:
+        #     True if a sync was pending (and has been run), False otherwise
+        
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if not self._sync_pending:
+                return False
+            self._sync_pending = False
+        
+        self._sync_to_hub()
+        return True
     
     def _sync_to_hub(self):
         # Sync vectorstore to HF Hub.
         
         if not self.hf_persistence:
-            print(f"[VECTORSTORE] ⚠️ HF persistence not available")
+            logger.warning("[VECTORSTORE] ⚠️ HF persistence not available")
             return
         
         if not self.hf_persistence.api:
-            print(f"[VECTORSTORE] ⚠️ HF API not initialized")
+            logger.warning("[VECTORSTORE] ⚠️ HF API not initialized")
             return
         
         try:
-            print(f"[VECTORSTORE] ☁️ Starting sync to HF Hub...")
+            logger.debug("[VECTORSTORE] ☁️ Starting sync to HF Hub...")
             success = self.hf_persistence.upload_vectorstore()
             if success:
-                print(f"[VECTORSTORE] ✅ Successfully synced to HF Hub")
+                logger.info("[VECTORSTORE] ✅ Successfully synced to HF Hub")
             else:
-                print(f"[VECTORSTORE] ⚠️ Sync to HF Hub returned False")
+                logger.warning("[VECTORSTORE] ⚠️ Sync to HF Hub returned False")
         except Exception as e:
-            print(f"[VECTORSTORE] ❌ Exception during HF Hub sync: {e}")
+            logger.error("[VECTORSTORE] ❌ Exception during HF Hub sync: %s", e)
             import traceback
             traceback.print_exc()
     
+    def _split_text(self, text: str) -> List[str]:
+        # Split a document into chunks on paragraph/sentence boundaries,
+        # falling back to fixed-size windows without langchain_text_splitters.
+        # 
+        # Args:
+        #     text: Text to chunk
+        # 
+        # Returns:
+        #     List of text chunks
+        
+        splitter = self.splitter
+        if splitter is None:
+            return self._chunk_text(text, self.CHUNK_SIZE, self.CHUNK_OVERLAP)
+        if SEMANTIC_SPLITTER_AVAILABLE:
+            return splitter.chunks(text)
+        return splitter.split_text(text)
+    
     def _chunk_text(self, text: str, chunk_size: int = 300, overlap: int = 100) -> List[str]:
-        # Split text into overlapping chunks.
+        # Split text into overlapping fixed-size chunks.
         # 
         # Args:
         #     text: Text to chunk
@@ -240,14 +762,30 @@ class VectorstoreManager:
         # 
         # Returns:
         #     List of text chunks
+        #
+        # Raises:
+        #     ValueError: If overlap is not smaller than chunk_size
+        
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError(f"overlap ({overlap}) must be smaller than chunk_size ({chunk_size})")
         
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunks.append(text[start:end])
-            start = end - overlap
-        return chunks
+        return [text[i:i + chunk_size] for i in range(0, len(text), step)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_embeddings(model: Optional[str] = None) -> OpenAIEmbeddings:
+    # Shared OpenAI embeddings client per model (default model when None).
+    # Reusing one client keeps its HTTP connection pool (and TLS sessions) alive
+    # across manager resets and callers.
+    # 
+    # Args:
+    #     model: Embedding model name
+    # 
+    # Returns:
+    #     OpenAIEmbeddings instance
+    
+    return OpenAIEmbeddings(model=model) if model else OpenAIEmbeddings()
 
 
 def get_vectorstore_manager() -> VectorstoreManager:
@@ -258,7 +796,9 @@ def get_vectorstore_manager() -> VectorstoreManager:
     
     global _vectorstore_instance
     if _vectorstore_instance is None:
-        _vectorstore_instance = VectorstoreManager()
+        with _vectorstore_instance_lock:
+            if _vectorstore_instance is None:
+                _vectorstore_instance = VectorstoreManager()
     return _vectorstore_instance
 
 
@@ -268,6 +808,6 @@ def reset_vectorstore_singleton():
     
     global _vectorstore_instance
     if _vectorstore_instance is not None:
-        print("[VECTORSTORE] 🔄 Resetting singleton instance")
+        logger.debug("[VECTORSTORE] 🔄 Resetting singleton instance")
         _vectorstore_instance = None
 
@@ -0,0 +1,70 @@
+# app/report/conversion_pool.py
+#
+# Process pool for CPU-bound report conversions (PDF via WeasyPrint, DOCX).
+# Conversions hold the GIL, so concurrent sessions would serialize on threads;
+# worker processes let several reports render in parallel.
+#
+
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Worker processes (0 = convert in the calling process)
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_conversion_pool() -> Optional[ProcessPoolExecutor]:
+    #
+    # Get the shared conversion pool, creating it on first use.
+    #
+    # Returns:
+    #     ProcessPoolExecutor, or None if REPORT_WORKERS is 0
+    #
+    global _pool
+    if REPORT_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking the threaded UI process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def run_conversion(func: Callable[..., Any], *args) -> Any:
+    #
+    # Run a conversion function in the pool and wait for its result.
+    # Falls back to the calling process if the pool is disabled or broken.
+    #
+    # Args:
+    #     func: Module-level (picklable) conversion function, e.g. create_temp_pdf
+    #     *args: Its arguments
+    #
+    # Returns:
+    #     The function's return value
+    #
+    global _pool
+    pool = get_conversion_pool()
+    if pool is None:
+        return func(*args)
+
+    try:
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool as e:
+        logger.warning("[REPORT] ⚠️ Conversion pool broken, converting in-process: %s", e)
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        return func(*args)
@@ -3,19 +3,34 @@
 # DOCX Converter - Converts HTML reports to DOCX format.
 #
 
-from typing import Optional
+from typing import IO, Optional
+import io
+import os
 import tempfile
 from html.parser import HTMLParser
 
+# lxml (installed with python-docx) parses in C; the stdlib parser is the fallback
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 
 class HTMLToDocxConverter(HTMLParser):
     #
     # Simple HTML to plain text converter for DOCX generation.
     #
     
+    # Tag sets checked on every start/end tag (hash lookups)
+    LINE_BREAK_START_TAGS = frozenset({'br', 'p', 'div'})
+    HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+    BLOCK_END_TAGS = frozenset({'p', 'div', 'li'})
+    
     def __init__(self):
         super().__init__()
-        self.text_parts = []
+        self._buffer = io.StringIO()
         self.in_style = False
         self.in_script = False
     
@@ -24,38 +39,97 @@ class HTMLToDocxConverter(HTMLParser):
             self.in_style = True
         elif tag == 'script':
             self.in_script = True
-        elif tag == 'br':
-            self.text_parts.append('\n')
-        elif tag in ['p', 'div']:
-            self.text_parts.append('\n')
+        elif tag in self.LINE_BREAK_START_TAGS:
+            self._buffer.write('\n')
     
     def handle_endtag(self, tag):
         if tag == 'style':
             self.in_style = False
         elif tag == 'script':
             self.in_script = False
-        elif tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            self.text_parts.append('\n\n')
-        elif tag in ['p', 'div', 'li']:
-            self.text_parts.append('\n')
+        elif tag in self.HEADING_TAGS:
+            self._buffer.write('\n\n')
+        elif tag in self.BLOCK_END_TAGS:
+            self._buffer.write('\n')
     
     def handle_data(self, data):
         if not self.in_style and not self.in_script:
-            self.text_parts.append(data)
+            self._buffer.write(data)
     
     def get_text(self):
-        return ''.join(self.text_parts)
+        return self._buffer.getvalue()
 
 
-def html_to_docx(html_content: str) -> Optional[bytes]:
+def _extract_text_lxml(html_content: str) -> str:
     #
-    # Convert HTML content to DOCX bytes.
+    # Same text extraction as HTMLToDocxConverter, as one walk over an lxml tree.
+    #
+    # Args:
+    #     html_content: HTML string
+    #
+    # Returns:
+    #     Plain text with line breaks around block elements
+    #
+    root = lxml_html.document_fromstring(html_content)
+    buffer = io.StringIO()
+    skipped = ('style', 'script')
+    
+    for event, element in etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+        tag = element.tag
+        if event in ('comment', 'pi'):
+            # Only the text after them counts
+            if element.tail:
+                buffer.write(element.tail)
+            continue
+        
+        if event == 'start':
+            if tag in HTMLToDocxConverter.LINE_BREAK_START_TAGS:
+                buffer.write('\n')
+            if element.text and tag not in skipped:
+                buffer.write(element.text)
+        else:
+            if tag in HTMLToDocxConverter.HEADING_TAGS:
+                buffer.write('\n\n')
+            elif tag in HTMLToDocxConverter.BLOCK_END_TAGS:
+                buffer.write('\n')
+            if element.tail:
+                buffer.write(element.tail)
+    
+    return buffer.getvalue()
+
+
+def extract_text(html_content: str) -> str:
+    #
+    # Extract the plain text used to build the DOCX document.
+    #
+    # Args:
+    #     html_content: HTML string
+    #
+    # Returns:
+    #     Plain text with line breaks around block elements
+    #
+    if LXML_AVAILABLE:
+        try:
+            return _extract_text_lxml(html_content)
+        except (etree.ParserError, ValueError):
+            # e.g. empty documents: let the stdlib parser handle them
+            pass
+    
+    parser = HTMLToDocxConverter()
+    parser.feed(html_content)
+    return parser.get_text()
+
+
+def html_to_docx_stream(html_content: str, sink: IO[bytes]) -> bool:
+    #
+    # Convert HTML content to DOCX, writing it straight into a binary sink.
     #
     # Args:
     #     html_content: HTML string to convert
+    #     sink: Writable binary file object (file on disk, BytesIO, ...)
     #
     # Returns:
-    #     DOCX bytes, or None if conversion fails
+    #     True if the document was written, False if conversion fails
     #
     # Raises:
     #     ImportError: If python-docx is not installed
@@ -65,12 +139,9 @@ def html_to_docx(html_content: str) -> Optional[bytes]:
         from docx import Document
         from docx.shared import Pt, RGBColor
         from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-        import io
         
         # Parse HTML to extract text
-        parser = HTMLToDocxConverter()
-        parser.feed(html_content)
-        text_content = parser.get_text()
+        text_content = extract_text(html_content)
         
         # Create document
         doc = Document()
@@ -97,12 +168,9 @@ def html_to_docx(html_content: str) -> Optional[bytes]:
             else:
                 doc.add_paragraph(line)
         
-        # Save to bytes
-        docx_bytes = io.BytesIO()
-        doc.save(docx_bytes)
-        docx_bytes.seek(0)
-        
-        return docx_bytes.getvalue()
+        # Serialize directly into the sink (no intermediate buffer copy)
+        doc.save(sink)
+        return True
     
     except ImportError:
         raise ImportError(
@@ -111,7 +179,27 @@ def html_to_docx(html_content: str) -> Optional[bytes]:
         )
     except Exception as e:
         print(f"[DOCX] ❌ Conversion failed: {e}")
+        return False
+
+
+def html_to_docx(html_content: str) -> Optional[bytes]:
+    #
+    # Convert HTML content to DOCX bytes.
+    #
+    # Args:
+    #     html_content: HTML string to convert
+    #
+    # Returns:
+    #     DOCX bytes, or None if conversion fails
+    #
+    # Raises:
+    #     ImportError: If python-docx is not installed
+    #
+    
+    docx_bytes = io.BytesIO()
+    if not html_to_docx_stream(html_content, docx_bytes):
         return None
+    return docx_bytes.getvalue()
 
 
 def create_temp_docx(html_content: str) -> Optional[str]:
@@ -126,23 +214,23 @@ def create_temp_docx(html_content: str) -> Optional[str]:
     #
     
     try:
-        docx_bytes = html_to_docx(html_content)
-        
-        if docx_bytes is None:
-            return None
-        
-        # Create temporary file
+        # Create temporary file and write the document straight into it
         temp_file = tempfile.NamedTemporaryFile(
             mode='wb',
             suffix=".docx",
             delete=False
         )
-        temp_file.write(docx_bytes)
-        temp_file.close()
+        written = False
+        try:
+            with temp_file:
+                written = html_to_docx_stream(html_content, temp_file)
+        finally:
+            # Don't leave empty/partial files behind on failure
+            if not written:
+                os.remove(temp_file.name)
         
-        return temp_file.name
+        return temp_file.name if written else None
     
     except Exception as e:
         print(f"[DOCX] ❌ Failed to create temp DOCX: {e}")
         return None
-
@@ -5,6 +5,27 @@
 
 from typing import Optional
 import tempfile
+import threading
+
+# Shared WeasyPrint font configuration (font discovery runs once per process)
+_font_config = None
+_font_config_lock = threading.Lock()
+
+
+def _get_font_config():
+    #
+    # Get the shared WeasyPrint FontConfiguration, creating it on first use.
+    #
+    # Returns:
+    #     weasyprint FontConfiguration instance
+    #
+    global _font_config
+    if _font_config is None:
+        with _font_config_lock:
+            if _font_config is None:
+                from weasyprint.text.fonts import FontConfiguration
+                _font_config = FontConfiguration()
+    return _font_config
 
 
 def html_to_pdf(html_content: str) -> Optional[bytes]:
@@ -24,8 +45,8 @@ def html_to_pdf(html_content: str) -> Optional[bytes]:
     try:
         from weasyprint import HTML
         
-        # Create PDF from HTML string
-        pdf_bytes = HTML(string=html_content).write_pdf()
+        # Create PDF from HTML string (reusing the already-initialized fonts)
+        pdf_bytes = HTML(string=html_content).write_pdf(font_config=_get_font_config())
         return pdf_bytes
     
     except ImportError:
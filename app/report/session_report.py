@@ -8,11 +8,76 @@
 #
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 import re
 from .template_loader import get_template_loader
 
 
+# Markdown → HTML, compiled once. Headers, bold and bullet points (- item or * item)
+# are converted in a single scan: one alternation regex, dispatched per match.
+# Bold inside a header or list item is converted within the matched line.
+_RE_MARKDOWN = re.compile(
+    r'(?P<h4>^####\s+(?P<h4_text>.+)$)'
+    r'|(?P<h3>^###\s+(?P<h3_text>.+)$)'
+    r'|(?P<h2>^##\s+(?P<h2_text>.+)$)'
+    r'|(?P<strong>\*\*(?P<strong_text>.+?)\*\*)'
+    r'|(?P<li>^\s*[-*]\s+(?P<li_text>.+)$)',
+    re.MULTILINE
+)
+_RE_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_RE_LIST_PLAIN = re.compile(r'(<li>.*?</li>\s*)+', re.DOTALL)
+_RE_LIST_STYLED = re.compile(r'(<li.*?</li>\s*)+', re.DOTALL)
+
+# Opening tag per construct (plain / inline-styled for Gradio rendering)
+_MARKDOWN_TAGS = {
+    'h4': '<h4>',
+    'h3': '<h3>',
+    'h2': '<h2>',
+    'strong': '<strong>',
+    'li': '<li>',
+}
+_MARKDOWN_TAGS_STYLED = {
+    'h4': '<h4 style="color: #000000; font-weight: bold; margin: 10px 0;">',
+    'h3': '<h3 style="color: #000000; font-weight: bold; margin: 12px 0;">',
+    'h2': '<h2 style="color: #000000; font-weight: bold; margin: 15px 0;">',
+    'strong': '<strong style="color: #000000; font-weight: bold;">',
+    'li': '<li style="color: #000000; margin-bottom: 8px; line-height: 1.5;">',
+}
+
+# Wrap consecutive <li> items in <ul>
+_LIST_WRAP = (_RE_LIST_PLAIN, r'<ul>\g<0></ul>')
+_LIST_WRAP_STYLED = (
+    _RE_LIST_STYLED,
+    r'<ul style="color: #000000; padding-left: 30px; margin: 10px 0; list-style-position: outside; list-style-type: disc;">\g<0></ul>'
+)
+
+
+def _markdown_replacer(tags: Dict[str, str]):
+    #
+    # Build the per-match replacement function for _RE_MARKDOWN.
+    #
+    strong_open = tags['strong']
+    
+    def replace(match):
+        kind = match.lastgroup
+        if kind.endswith('_text'):
+            # lastgroup is the innermost closed group; map it back to its construct
+            kind = kind[:-5]
+        content = match.group(f'{kind}_text')
+        if kind != 'strong':
+            content = _RE_BOLD.sub(lambda m: f'{strong_open}{m.group(1)}</strong>', content)
+        return f'{tags[kind]}{content}</{kind}>'
+    
+    return replace
+
+
+_REPLACE_MARKDOWN = _markdown_replacer(_MARKDOWN_TAGS)
+_REPLACE_MARKDOWN_STYLED = _markdown_replacer(_MARKDOWN_TAGS_STYLED)
+
+_PARAGRAPH_OPEN = '<p>'
+_PARAGRAPH_OPEN_STYLED = '<p style="color: #000000; margin: 8px 0;">'
+
+
 def markdown_to_html(text: str, inline_styles: bool = False) -> str:
     #
     # Convert basic Markdown formatting to HTML.
@@ -25,50 +90,36 @@ def markdown_to_html(text: str, inline_styles: bool = False) -> str:
     if not text:
         return ""
     
-    # Convert headers with optional inline styles
-    if inline_styles:
-        text = re.sub(r'^####\s+(.+)$', r'<h4 style="color: #000000; font-weight: bold; margin: 10px 0;">\1</h4>', text, flags=re.MULTILINE)
-        text = re.sub(r'^###\s+(.+)$', r'<h3 style="color: #000000; font-weight: bold; margin: 12px 0;">\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^##\s+(.+)$', r'<h2 style="color: #000000; font-weight: bold; margin: 15px 0;">\1</h2>', text, flags=re.MULTILINE)
-    else:
-        text = re.sub(r'^####\s+(.+)$', r'<h4>\1</h4>', text, flags=re.MULTILINE)
-        text = re.sub(r'^###\s+(.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^##\s+(.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
-    
-    # Convert bold text **text** to <strong>text</strong> with optional inline styles
-    if inline_styles:
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong style="color: #000000; font-weight: bold;">\1</strong>', text)
-    else:
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-    
-    # Convert bullet points (- item or * item) with optional inline styles
-    if inline_styles:
-        text = re.sub(r'^\s*[-*]\s+(.+)$', r'<li style="color: #000000; margin-bottom: 8px; line-height: 1.5;">\1</li>', text, flags=re.MULTILINE)
-    else:
-        text = re.sub(r'^\s*[-*]\s+(.+)$', r'<li>\1</li>', text, flags=re.MULTILINE)
-    
-    # Wrap consecutive <li> items in <ul> with optional inline styles
-    if inline_styles:
-        text = re.sub(r'(<li.*?</li>\s*)+', r'<ul style="color: #000000; padding-left: 30px; margin: 10px 0; list-style-position: outside; list-style-type: disc;">\g<0></ul>', text, flags=re.DOTALL)
-    else:
-        text = re.sub(r'(<li>.*?</li>\s*)+', r'<ul>\g<0></ul>', text, flags=re.DOTALL)
+    # Headers, bold and bullet points in one pass, then <ul> around consecutive <li>
+    text = _RE_MARKDOWN.sub(_REPLACE_MARKDOWN_STYLED if inline_styles else _REPLACE_MARKDOWN, text)
+    list_pattern, list_replacement = _LIST_WRAP_STYLED if inline_styles else _LIST_WRAP
+    text = list_pattern.sub(list_replacement, text)
     
-    # Convert double newlines to paragraphs with optional inline styles
-    paragraphs = text.split('\n\n')
+    # Convert double newlines to paragraphs
+    paragraph_open = _PARAGRAPH_OPEN_STYLED if inline_styles else _PARAGRAPH_OPEN
     formatted_paragraphs = []
-    for p in paragraphs:
+    for p in text.split('\n\n'):
         p = p.strip()
         if p and not p.startswith('<'):  # Don't wrap if already HTML tag
-            if inline_styles:
-                formatted_paragraphs.append(f'<p style="color: #000000; margin: 8px 0;">{p}</p>')
-            else:
-                formatted_paragraphs.append(f'<p>{p}</p>')
+            formatted_paragraphs.append(f'{paragraph_open}{p}</p>')
         else:
             formatted_paragraphs.append(p)
     
     return '\n'.join(formatted_paragraphs)
 
 
+def _message_role_content(msg: Any) -> Tuple[Any, Any]:
+    #
+    # Extract (role, content) from a message.
+    # Handles both dict and LangChain Message objects.
+    #
+    if hasattr(msg, 'type'):  # LangChain Message object
+        return msg.type, (msg.content if hasattr(msg, 'content') else str(msg))
+    if isinstance(msg, dict):  # Dict format
+        return msg.get("role", "unknown"), msg.get("content", "")
+    return "unknown", str(msg)
+
+
 def _format_messages_html(messages: list, inline_styles: bool = False) -> str:
     #
     # Format messages list as HTML list items.
@@ -83,16 +134,7 @@ def _format_messages_html(messages: list, inline_styles: bool = False) -> str:
     messages_html = ""
     
     for msg in messages:
-        # Handle both dict and LangChain Message objects
-        if hasattr(msg, 'type'):  # LangChain Message object
-            role = msg.type if hasattr(msg, 'type') else 'unknown'
-            content = msg.content if hasattr(msg, 'content') else str(msg)
-        elif isinstance(msg, dict):  # Dict format
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-        else:
-            role = "unknown"
-            content = str(msg)
+        role, content = _message_role_content(msg)
         
         if inline_styles:
             messages_html += f'<li style="color: #000000; margin-bottom: 8px; line-height: 1.5;"><strong style="color: #000000; font-weight: bold;">{role}:</strong> {content}</li>'
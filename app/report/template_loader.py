@@ -9,8 +9,12 @@
 #
 
 import os
+from collections import OrderedDict
 from string import Template
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+# Compiled template: (literal text, placeholder key or None, placeholder source) triples
+CompiledTemplate = List[Tuple[str, Optional[str], str]]
 
 
 class TemplateLoader:
@@ -21,6 +25,9 @@ class TemplateLoader:
     # Uses simple $variable substitution (no complex logic needed).
     #
     
+    # Upper bound on cached template text (least recently used templates are evicted)
+    MAX_CACHE_BYTES = 4 * 1024 * 1024
+    
     def __init__(self, templates_dir: str = None):
         #
         # Initialize template loader.
@@ -34,7 +41,9 @@ class TemplateLoader:
             templates_dir = os.path.join(current_dir, "templates")
         
         self.templates_dir = templates_dir
-        self._cache = {}  # Cache loaded templates
+        self._cache = OrderedDict()  # Cache loaded templates (LRU order)
+        self._cache_bytes = 0  # UTF-8 size of the cached template texts
+        self._compiled = {}  # Cache templates pre-split into literals/placeholders
     
     def load_template(self, template_name: str) -> Template:
         #
@@ -52,6 +61,7 @@ class TemplateLoader:
         
         # Check cache first
         if template_name in self._cache:
+            self._cache.move_to_end(template_name)
             return self._cache[template_name]
         
         # Load from disk
@@ -66,9 +76,20 @@ class TemplateLoader:
         # Create Template and cache it
         template = Template(template_content)
         self._cache[template_name] = template
+        self._cache_bytes += self._template_size(template)
+        
+        # Evict least recently used templates beyond the byte budget (keep the new one)
+        while self._cache_bytes > self.MAX_CACHE_BYTES and len(self._cache) > 1:
+            evicted_name, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= self._template_size(evicted)
+            self._compiled.pop(evicted_name, None)
         
         return template
     
+    @staticmethod
+    def _template_size(template: Template) -> int:
+        return len(template.template.encode('utf-8'))
+    
     def render(self, template_name: str, context: Dict[str, Any]) -> str:
         #
         # Render a template with provided context data.
@@ -80,14 +101,61 @@ class TemplateLoader:
         # Returns:
         #     Rendered HTML string
         #
-        template = self.load_template(template_name)
-        return template.safe_substitute(context)
+        template = self.load_template(template_name)  # also refreshes its LRU position
+        parts = self._compiled.get(template_name)
+        if parts is None:
+            parts = self._compile(template)
+            self._compiled[template_name] = parts
+        
+        # Same result as template.safe_substitute(context), without a regex pass per render
+        rendered = []
+        for literal, key, source in parts:
+            rendered.append(literal)
+            if key is not None:
+                rendered.append(str(context[key]) if key in context else source)
+        return ''.join(rendered)
+    
+    @staticmethod
+    def _compile(template: Template) -> CompiledTemplate:
+        #
+        # Split a template once into literal text and placeholders.
+        # Follows safe_substitute: $$ becomes $, invalid placeholders stay verbatim,
+        # and missing keys render as their original $name / ${name} text.
+        #
+        # Args:
+        #     template: string.Template to compile
+        #
+        # Returns:
+        #     List of (literal, key, source) triples; key is None for trailing text
+        #
+        text = template.template
+        parts = []
+        literal = []
+        position = 0
+        
+        for match in template.pattern.finditer(text):
+            literal.append(text[position:match.start()])
+            position = match.end()
+            key = match.group('named') or match.group('braced')
+            if key is not None:
+                parts.append((''.join(literal), key, match.group()))
+                literal = []
+            elif match.group('escaped') is not None:
+                literal.append(template.delimiter)
+            else:
+                literal.append(match.group())
+        
+        literal.append(text[position:])
+        parts.append((''.join(literal), None, ''))
+        return parts
     
     def clear_cache(self):
         #
         # Clear template cache (useful for development/testing).
         #
         self._cache.clear()
+        self._cache_bytes = 0
+        self._compiled.clear()
 
 
 # Singleton instance for easy import
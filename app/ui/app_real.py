@@ -14,6 +14,9 @@
 # - FileManager: Backend state singleton
 #
 import os
+import logging
+import importlib
+import threading
 import gradio as gr
 
 # Import UI components
@@ -27,31 +30,138 @@ from .components.output_report import create_output_report
 from .components.report_preview_section import create_report_preview_section
 from .components.report_download_section import create_report_download_section
 
-# Import handlers
-from .handlers.graph_handler_parallel import run_graph_parallel_streaming
+# Import handlers (the decision graph and RAG handlers are imported lazily, see below)
 from .handlers.report_format_handler import handle_format_change
-from .handlers.rag_handlers import (
-    init_ui_on_load,
-    handle_file_upload,
-    handle_refresh,
-    handle_clear_files
-)
+
+logger = logging.getLogger(__name__)
 
 # Debug import removed - was interfering with Gradio API schema generation
 # from scripts.check_component_types import check_component_types
 
+# Queue settings: handlers are I/O-bound (OpenAI/Chroma calls), so several
+# sessions can run at once instead of waiting end-to-end behind each other
+UI_CONCURRENCY_LIMIT = int(os.getenv("UI_CONCURRENCY_LIMIT", "16"))
+UI_QUEUE_MAX_SIZE = int(os.getenv("UI_QUEUE_MAX_SIZE", "64"))
+# Concurrent decision-graph runs (submit button and Enter key share the pool)
+GRAPH_CONCURRENCY_LIMIT = int(os.getenv("GRAPH_CONCURRENCY_LIMIT", "4"))
+GRAPH_CONCURRENCY_ID = "llm_queue"
+# Upload and clear both mutate the shared FileManager/vectorstore state,
+# so they run one at a time through a single shared queue
+RAG_WRITE_CONCURRENCY_ID = "rag_write"
+
+# Largest accepted upload; Gradio rejects bigger files in the browser, before
+# any bytes are sent (accepted file types are set on the upload component)
+MAX_UPLOAD_SIZE = os.getenv("RAG_MAX_UPLOAD_SIZE", "20mb")
+
+# Server-side rendering of the first page (needs Node.js on the host; opt-in)
+SSR_MODE = os.getenv("GRADIO_SSR_MODE", "false").lower() == "true"
+
+# Theme and static text, built once at import instead of on every launch
+TITLE_COLOR = "#ffffff"
+SUBTITLE_COLOR = "#a0aec0"
+
+THEME = gr.themes.Soft(
+    primary_hue="violet",
+    secondary_hue="purple",
+    neutral_hue="slate",
+    font=["Helvetica", "Arial", "sans-serif"]
+)
+
+# One stylesheet for the static intro/footer text, instead of inline styles
+# repeated on every paragraph
+APP_CSS = f"""
+.tab-intro {{ color: {SUBTITLE_COLOR}; margin-bottom: 15px; }}
+.app-footer {{ text-align: center; color: {SUBTITLE_COLOR}; font-size: 0.9em; }}
+"""
+
+MESSAGES_INTRO_HTML = (
+    "<p class='tab-intro'>View the complete conversation history and reasoning steps.</p>"
+)
+HISTORICAL_INTRO_HTML = (
+    "<p class='tab-intro'>Similar decisions from past sessions that may inform your current analysis.</p>"
+)
+RAG_EVIDENCE_INTRO_HTML = (
+    "<p class='tab-intro'>Context documents and retrieved evidence used to ground the analysis.</p>"
+)
+FOOTER_HTML = "<p class='app-footer'>🤖 Powered by LangGraph, OpenAI GPT-4, and ChromaDB</p>"
+
+# Heavy module behind the submit handler (graph nodes, LangChain, OpenAI clients)
+GRAPH_HANDLER_MODULE = f"{__package__}.handlers.graph_handler_parallel"
+
+
+def run_decision_graph(question, rag_files=None):
+    # Streaming submit handler that imports the decision graph on first use.
+    # Kept a generator function so Gradio still streams its partial updates.
+
+    graph_handler = importlib.import_module(GRAPH_HANDLER_MODULE)
+    yield from graph_handler.run_graph_parallel_streaming(question, rag_files)
+
+
+# Module behind the RAG file handlers (FileManager, vectorstore, Chroma, OpenAI
+# embeddings). The wrappers below import it on first use, not with the UI.
+RAG_HANDLER_MODULE = f"{__package__}.handlers.rag_handlers"
+
+
+def init_ui_on_load():
+    return importlib.import_module(RAG_HANDLER_MODULE).init_ui_on_load()
+
+
+def handle_file_upload(uploaded_files):
+    return importlib.import_module(RAG_HANDLER_MODULE).handle_file_upload(uploaded_files)
+
+
+def handle_refresh():
+    return importlib.import_module(RAG_HANDLER_MODULE).handle_refresh()
+
+
+def handle_clear_files():
+    return importlib.import_module(RAG_HANDLER_MODULE).handle_clear_files()
+
+
+def _preload_graph_handler():
+    # Import the decision graph in the background while the server starts,
+    # so neither startup nor the first question waits for it
+
+    try:
+        importlib.import_module(GRAPH_HANDLER_MODULE)
+    except Exception as e:
+        logger.warning("[UI] ⚠️ Decision graph preload failed: %s", e)
+
+
+def _preload_file_manager():
+    # Build the FileManager (HF Hub registry load) in the background while the
+    # UI is assembled; the file panel's initial values wait on the same build
+
+    try:
+        from app.rag.file_manager import get_file_manager
+        get_file_manager()
+    except Exception as e:
+        logger.warning("[UI] ⚠️ File manager preload failed: %s", e)
+
+
+def _preload_vectorstore():
+    # Open the vectorstore (HF Hub download + local Chroma load) in the
+    # background, so the first upload or question does not pay for it.
+    # Requests arriving earlier wait on the same initialization.
+
+    try:
+        from app.rag.vectorstore_manager import get_vectorstore_manager
+        get_vectorstore_manager().get_vectorstore()
+    except Exception as e:
+        logger.warning("[UI] ⚠️ Vectorstore preload failed: %s", e)
+
+
 # -----------------------------
 # Main UI Assembly
 # -----------------------------
 def launch_real_ui():
     # Launch the Gradio UI for the AI Decision Support Agent.
 
+    threading.Thread(target=_preload_file_manager, name="file_manager_preload", daemon=True).start()
+
     # ------------------------
     # Create UI Components
     # ------------------------
-    TITLE_COLOR = "#ffffff"
-    SUBTITLE_COLOR = "#a0aec0"
-
     # Outputs
     plan_output = create_output_plan()
     analysis_output = create_output_analysis()
@@ -66,13 +176,6 @@ def launch_real_ui():
     # ------------------------
     # Assemble UI Layout
     # ------------------------
-    theme = gr.themes.Soft(
-        primary_hue="violet",
-        secondary_hue="purple",
-        neutral_hue="slate",
-        font=["Helvetica", "Arial", "sans-serif"]
-    )
-
     with gr.Blocks() as demo:
         # ------------------------
         # HF-SAFE SETTINGS
@@ -98,14 +201,14 @@ def launch_real_ui():
         gr.Markdown("---")
 
         # Output Tabs
-        with gr.Tabs() as tabs:
+        with gr.Tabs():
             # Planning & Analysis
             with gr.Tab("📊 Planning & Analysis"):
                 with gr.Row():
-                    with gr.Column(scale=1):
+                    with gr.Column():
                         gr.Markdown("### 📋 Step-by-Step Plan")
                         plan_output.render()
-                    with gr.Column(scale=1):
+                    with gr.Column():
                         gr.Markdown("### 🔍 Analysis")
                         analysis_output.render()
 
@@ -121,11 +224,7 @@ def launch_real_ui():
             # Conversation Log
             with gr.Tab("💬 Messages"):
                 gr.Markdown("### 💬 Conversation History")
-                gr.Markdown(
-                    f"<p style='color:{SUBTITLE_COLOR}; margin-bottom:15px;'>"
-                    "View the complete conversation history and reasoning steps."
-                    "</p>"
-                )
+                gr.HTML(MESSAGES_INTRO_HTML)
                 messages_output.render()
 
             # Session Report
@@ -136,84 +235,73 @@ def launch_real_ui():
 
             # Historical Decisions
             with gr.Tab("📜 Historical Decisions"):
-                gr.Markdown(
-                    f"<p style='color:{SUBTITLE_COLOR}; margin-bottom:15px;'>"
-                    "Similar decisions from past sessions that may inform your current analysis."
-                    "</p>"
-                )
+                gr.HTML(HISTORICAL_INTRO_HTML)
                 historical_output.render()
 
             # RAG Context & Evidence
             with gr.Tab("📚 RAG Context & Evidence"):
-                gr.Markdown(
-                    f"<p style='color:{SUBTITLE_COLOR}; margin-bottom:15px;'>"
-                    "Context documents and retrieved evidence used to ground the analysis."
-                    "</p>"
-                )
+                gr.HTML(RAG_EVIDENCE_INTRO_HTML)
                 rag_evidence_output.render()
 
         # Footer
         gr.Markdown("---")
-        gr.Markdown(
-            f"<p style='text-align:center; color:{SUBTITLE_COLOR}; font-size:0.9em;'>"
-            "🤖 Powered by LangGraph, OpenAI GPT-4, and ChromaDB"
-            "</p>"
-        )
+        gr.HTML(FOOTER_HTML)
 
         # ========================================
         # SIMPLE EVENT-DRIVEN PATTERN
         # ========================================
 
+        # File list views refreshed by every RAG handler
+        file_list_outputs = [storage_summary, files_list_display]
+
         # 1️⃣ Initialize UI on page load/reload
         demo.load(
             fn=init_ui_on_load,
             inputs=None,
-            outputs=[storage_summary, files_list_display]
+            outputs=file_list_outputs,
+            concurrency_limit=None,
+            # Renders cached file-list strings: instantaneous, no spinner
+            show_progress="hidden"
         )
 
         # 2️⃣ File upload → returns updated values
         rag_input.upload(
             fn=handle_file_upload,
             inputs=[rag_input],
-            outputs=[upload_status_output, storage_summary, files_list_display]
+            outputs=[upload_status_output, *file_list_outputs],
+            concurrency_limit=1,
+            concurrency_id=RAG_WRITE_CONCURRENCY_ID
         )
 
         # 3️⃣ Refresh button → returns updated values
         refresh_files_btn.click(
             fn=handle_refresh,
             inputs=[],
-            outputs=[storage_summary, files_list_display]
+            outputs=file_list_outputs,
+            concurrency_limit=None,
+            show_progress="hidden"
         )
 
         # 4️⃣ Clear button → returns updated values
         clear_files_btn.click(
             fn=handle_clear_files,
             inputs=[],
-            outputs=[clear_status_display, storage_summary, files_list_display]
+            outputs=[clear_status_display, *file_list_outputs],
+            concurrency_limit=1,
+            concurrency_id=RAG_WRITE_CONCURRENCY_ID,
+            # Resets the vectorstore and the Hub registry, which can take seconds
+            show_progress="minimal"
         )
 
         # ========================================
         # DECISION GRAPH EXECUTION
         # ========================================
 
-        submit_button.click(
-            fn=run_graph_parallel_streaming,
-            inputs=[question_input, rag_input],
-            outputs=[
-                plan_output,
-                analysis_output,
-                decision_output,
-                confidence_output,
-                messages_output,
-                report_output,
-                report_download_output,
-                historical_output,
-                rag_evidence_output
-            ]
-        )
-
-        question_input.submit(
-            fn=run_graph_parallel_streaming,
+        # Button and Enter key register one event (one queue entry and one
+        # concurrency pool) instead of two identical ones
+        gr.on(
+            triggers=[submit_button.click, question_input.submit],
+            fn=run_decision_graph,
             inputs=[question_input, rag_input],
             outputs=[
                 plan_output,
@@ -225,18 +313,31 @@ def launch_real_ui():
                 report_download_output,
                 historical_output,
                 rag_evidence_output
-            ]
+            ],
+            concurrency_limit=GRAPH_CONCURRENCY_LIMIT,
+            concurrency_id=GRAPH_CONCURRENCY_ID,
+            # Outputs stream in progressively; a full-panel spinner would hide them
+            show_progress="minimal"
         )
 
         format_selector.change(
             fn=handle_format_change,
             inputs=[format_selector],
-            outputs=[report_download_output]
+            outputs=[report_download_output],
+            concurrency_limit=None,
+            # PDF/DOCX conversion can take seconds
+            show_progress="minimal"
         )
 
+    threading.Thread(target=_preload_graph_handler, name="graph_preload", daemon=True).start()
+    threading.Thread(target=_preload_vectorstore, name="vectorstore_preload", daemon=True).start()
+
     # Enable queue for streaming functionality only if NOT on HF Spaces
     if not os.getenv("HF_SPACE_ID"):
-        demo.queue()
+        demo.queue(
+            default_concurrency_limit=UI_CONCURRENCY_LIMIT,
+            max_size=UI_QUEUE_MAX_SIZE
+        )
 
     # Launch the Gradio interface
     # demo.launch(
@@ -244,8 +345,14 @@ def launch_real_ui():
     #     server_port=7860,
     #     show_api=False  # Disable API schema generation (causes issues in Gradio 5.9.1)
     # )
-    demo.launch(theme=theme, ssr_mode=False)
+    demo.launch(
+        theme=THEME,
+        css=APP_CSS,
+        ssr_mode=SSR_MODE,
+        max_file_size=MAX_UPLOAD_SIZE
+    )
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     launch_real_ui()
@@ -55,9 +55,10 @@ def save_report_for_download(report_html: str, format_type: str = "HTML") -> str
     
     if format_type.upper() == "PDF":
         from app.report.pdf_converter import create_temp_pdf
+        from app.report.conversion_pool import run_conversion
         
         try:
-            pdf_path = create_temp_pdf(report_html)
+            pdf_path = run_conversion(create_temp_pdf, report_html)
             if pdf_path:
                 print(f"[REPORT] ✅ PDF report saved: {pdf_path}")
                 return pdf_path
@@ -72,9 +73,10 @@ def save_report_for_download(report_html: str, format_type: str = "HTML") -> str
     
     elif format_type.upper() == "DOCX":
         from app.report.docx_converter import create_temp_docx
+        from app.report.conversion_pool import run_conversion
         
         try:
-            docx_path = create_temp_docx(report_html)
+            docx_path = run_conversion(create_temp_docx, report_html)
             if docx_path:
                 print(f"[REPORT] ✅ DOCX report saved: {docx_path}")
                 return docx_path
@@ -9,11 +9,6 @@
 import gradio as gr
 from typing import Tuple
 
-from app.rag.file_manager import get_file_manager
-
-# Get singleton instance for initial values
-file_manager = get_file_manager()
-
 
 def create_rag_file_input():
     # Create the RAG file input component.
@@ -56,7 +51,10 @@ def create_rag_file_manager() -> Tuple:
     print("🏗️ CREATING RAG File Manager Components (Simple Pattern)")
     print("🏗️"*35)
     
-    # Get initial values
+    # Get initial values (imported here so importing the UI does not load the
+    # FileManager and the vectorstore stack behind it)
+    from app.rag.file_manager import get_file_manager
+    file_manager = get_file_manager()
     initial_summary = file_manager.render_storage_summary()
     initial_files_text = file_manager.render_files_text()
     
@@ -6,15 +6,28 @@
 # - No gr.State needed
 # - Gradio propagates return values automatically
 
-from .rag_handlers import (
-    init_ui_on_load,
-    handle_file_upload,
-    handle_refresh,
-    handle_clear_files,
-    get_files_status_text,
-    get_storage_summary
-)
-from .graph_handler_parallel import run_graph_parallel_streaming
+import importlib
+
+# Handlers imported on first access: the graph handler pulls in the graph nodes,
+# LangChain and the OpenAI clients, the RAG handlers the FileManager, Chroma and
+# the embeddings client. Importing the UI needs none of them.
+_LAZY_HANDLERS = {
+    "init_ui_on_load": ".rag_handlers",
+    "handle_file_upload": ".rag_handlers",
+    "handle_refresh": ".rag_handlers",
+    "handle_clear_files": ".rag_handlers",
+    "get_files_status_text": ".rag_handlers",
+    "get_storage_summary": ".rag_handlers",
+    "run_graph_parallel_streaming": ".graph_handler_parallel",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_HANDLERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     "init_ui_on_load",
@@ -17,6 +17,8 @@
 
 import time
 
+import gradio as gr
+
 # Import streaming nodes
 from app.graph.nodes.intake import intake_node
 from app.graph.nodes.planner_streaming import planner_node_stream
@@ -169,6 +171,9 @@ def run_graph_parallel_streaming(
         analysis_accumulated = ""
         planner_done = False
         analyzer_done = False
+        # Stream state at the last yield, and (plan, analysis) text sent in it
+        last_progress = None
+        last_frame = None
         
         import time
         
@@ -199,6 +204,13 @@ def run_graph_parallel_streaming(
                 except:
                     pass  # Queue empty, continue
             
+            # Skip the frame entirely when neither stream has progressed
+            progress = (plan_accumulated, analysis_accumulated, planner_done, analyzer_done)
+            if progress == last_progress:
+                time.sleep(0.05)
+                continue
+            last_progress = progress
+            
             # Convert markdown to plain text for consistent UI display
             # (State will keep original markdown for HTML report generation)
             plan_display = md_to_plain_text(plan_accumulated) if plan_accumulated else ""
@@ -210,18 +222,33 @@ def run_graph_parallel_streaming(
             if not analyzer_done and analysis_display:
                 analysis_display = "⏳ Analyzing independently...\n\n" + analysis_display
             
-            # Yield progressive update with plain text
-            yield _format_streaming_output(
-                plan=plan_display,
-                analysis=analysis_display,
-                decision="",
-                confidence=0.0,
-                messages="",
-                report_preview="",
-                report_file_path=None,  # None for gr.File when no file available
-                historical_html="",
-                rag_evidence_html=""
-            )
+            if last_frame is None:
+                # First frame: also clears the outputs of the previous run
+                yield _format_streaming_output(
+                    plan=plan_display,
+                    analysis=analysis_display,
+                    decision="",
+                    confidence=0.0,
+                    messages="",
+                    report_preview="",
+                    report_file_path=None,  # None for gr.File when no file available
+                    historical_html="",
+                    rag_evidence_html=""
+                )
+            else:
+                # Later frames only carry the fields that changed
+                yield _format_streaming_output(
+                    plan=plan_display if plan_display != last_frame[0] else gr.update(),
+                    analysis=analysis_display if analysis_display != last_frame[1] else gr.update(),
+                    decision=gr.update(),
+                    confidence=gr.update(),
+                    messages=gr.update(),
+                    report_preview=gr.update(),
+                    report_file_path=gr.update(),
+                    historical_html=gr.update(),
+                    rag_evidence_html=gr.update()
+                )
+            last_frame = (plan_display, analysis_display)
             
             time.sleep(0.05)  # Small delay to avoid excessive updates
         
@@ -20,9 +20,6 @@
 from app.rag.file_manager import get_file_manager
 from .rag import StatusMessageBuilder, FilePathExtractor, UploadResult, OperationLogger
 
-# Get singleton FileManager instance
-file_manager = get_file_manager()
-
 
 def get_files_status_text():
     #
@@ -36,7 +33,7 @@ def get_files_status_text():
     OperationLogger.status_text_requested()
     
     # Just render current state (no refresh to preserve recently uploaded files)
-    text = file_manager.render_files_text()
+    text = get_file_manager().render_files_text()
     
     OperationLogger.status_text_returned(len(text))
     
@@ -51,7 +48,7 @@ def get_storage_summary():
     #     Formatted storage summary
     #
     
-    return file_manager.render_storage_summary()
+    return get_file_manager().render_storage_summary()
 
 
 def handle_file_upload(uploaded_files):
@@ -108,27 +105,30 @@ def _process_upload_batch(uploaded_files):
     # Returns:
     #     UploadResult with counts and failed files
     #
-    saved_count = 0
+    file_paths = []
     failed_files = []
     
     for file_obj in uploaded_files:
         try:
             # Use FilePathExtractor to handle different formats
             file_path = FilePathExtractor.extract_path(file_obj)
-            
             OperationLogger.file_processing(file_path)
-            
-            # Save file (FileManager automatically refreshes state)
-            file_manager.save_uploaded_file(file_path)
-            saved_count += 1
-            
-            OperationLogger.file_saved(file_path)
-            
+            file_paths.append(file_path)
         except Exception as e:
-            OperationLogger.file_failed(str(file_path) if 'file_path' in locals() else 'unknown', e)
-            failed_files.append(str(file_path) if 'file_path' in locals() else 'unknown')
+            OperationLogger.file_failed('unknown', e)
+            failed_files.append('unknown')
+    
+    # Save all files and embed them in a single vectorstore batch
+    saved, failed = get_file_manager().save_uploaded_files(file_paths)
+    
+    for result in saved:
+        OperationLogger.file_saved(result["original_name"])
     
-    return UploadResult(saved_count, failed_files)
+    for file_path, error in failed:
+        OperationLogger.file_failed(str(file_path), error)
+        failed_files.append(str(file_path))
+    
+    return UploadResult(len(saved), failed_files)
 
 
 def handle_refresh():
@@ -147,8 +147,6 @@ def handle_refresh():
     # Files are already in memory from upload and already embedded.
     # Just re-render the current state.
     
-    print(f"[RAG_HANDLERS] 🔄 Re-rendering current state (no disk reload)")
-    
     OperationLogger.refresh_complete()
     
     return get_storage_summary(), get_files_status_text()
@@ -164,7 +162,7 @@ def handle_clear_files():
     
     OperationLogger.clear_started()
     
-    deleted_count = file_manager.clear_all_files()
+    deleted_count = get_file_manager().clear_all_files()
     
     # Use StatusMessageBuilder for consistent messaging
     status_msg = StatusMessageBuilder.clear_status(deleted_count)
@@ -190,8 +188,6 @@ def init_ui_on_load():
     # Files are preserved in memory during the session.
     # On first app startup, _files is empty anyway.
     
-    print(f"[RAG_HANDLERS] ℹ️ Init UI - preserving in-memory file state")
-    
     summary = get_storage_summary()
     files_text = get_files_status_text()
     
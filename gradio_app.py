@@ -3,9 +3,13 @@
 # This file is specifically for HF Spaces - local development uses app/ui/app_real.py
 
 import os
+import logging
 from app.ui.app_real import launch_real_ui
 
 if __name__ == "__main__":
+    # Keep production logs quiet unless explicitly requested
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+
     # Launch the Gradio UI
     # HF Spaces will automatically detect and run this
     launch_real_ui()
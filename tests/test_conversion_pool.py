@@ -0,0 +1,20 @@
+# tests/test_conversion_pool.py
+#
+# Tests for the report conversion process pool.
+#
+
+from app.report import conversion_pool
+
+
+def test_run_conversion_in_worker_process():
+    assert conversion_pool.run_conversion(len, "report") == 6
+
+
+def test_run_conversion_inline_when_disabled(monkeypatch):
+    monkeypatch.setattr(conversion_pool, "REPORT_WORKERS", 0)
+    calls = []
+
+    result = conversion_pool.run_conversion(lambda html: calls.append(html) or "path.pdf", "<html/>")
+
+    assert result == "path.pdf"
+    assert calls == ["<html/>"]
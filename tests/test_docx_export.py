@@ -113,6 +113,47 @@ def test_html_to_docx_with_structure():
     print("✅ Structured DOCX conversion successful")
 
 
+def test_html_text_extraction_keeps_block_breaks():
+    # Test the HTML → text pass that feeds the DOCX builder (no python-docx needed).
+    
+    from app.report.docx_converter import HTMLToDocxConverter
+    
+    parser = HTMLToDocxConverter()
+    parser.feed("<style>h1 {}</style><h1>Title</h1><p>a<br>b</p><ul><li>item</li></ul>")
+    
+    assert parser.get_text() == "Title\n\n\na\nb\nitem\n"
+
+
+
+def test_lxml_text_extraction_matches_stdlib_parser():
+    # Test that the lxml fast path yields the same lines as the stdlib parser.
+    
+    pytest.importorskip("lxml")
+    from app.report.docx_converter import HTMLToDocxConverter, extract_text
+    
+    html = "<style>p {}</style><h1>Title</h1><p>a &amp; b<br>c</p><!-- note -->tail<ul><li>item</li></ul>"
+    parser = HTMLToDocxConverter()
+    parser.feed(html)
+    
+    def lines(text):
+        return [line.strip() for line in text.split("\n") if line.strip()]
+    
+    assert lines(extract_text(html)) == lines(parser.get_text())
+    assert lines(extract_text(html)) == ["Title", "a & b", "c", "tailitem"]
+
+
+def test_html_to_docx_stream_writes_into_sink():
+    # Test that the streaming variant writes the document straight into a file object.
+    
+    pytest.importorskip("docx")
+    import io
+    from app.report.docx_converter import html_to_docx_stream
+    
+    sink = io.BytesIO()
+    
+    assert html_to_docx_stream("<h1>Decision</h1><p>Proceed.</p>", sink) is True
+    assert sink.getvalue()[:2] == b'PK'
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
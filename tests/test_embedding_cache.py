@@ -0,0 +1,77 @@
+# tests/test_embedding_cache.py
+#
+# Tests for the persistent SQLite embedding cache.
+#
+
+import pytest
+
+from app.rag.embedding_cache import EmbeddingCache
+
+
+def test_get_many_returns_stored_vectors_and_misses(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", "model-a")
+    cache.put_many(["alpha", "beta"], [[0.5, 1.0], [2.0, -0.25]])
+
+    assert cache.get_many(["beta", "gamma", "alpha"]) == [[2.0, -0.25], None, [0.5, 1.0]]
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    db_path = tmp_path / "cache.sqlite3"
+    EmbeddingCache(db_path, "model-a").put_many(["alpha"], [[1.0]])
+
+    assert EmbeddingCache(db_path, "model-b").get_many(["alpha"]) == [None]
+    assert EmbeddingCache(db_path, "model-a").get_many(["alpha"]) == [[1.0]]
+
+
+def test_memory_tier_is_bounded_lru(tmp_path, monkeypatch):
+    monkeypatch.setattr(EmbeddingCache, "MAX_MEMORY_ENTRIES", 2)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", "model-a")
+    cache.put_many(["a", "b"], [[1.0], [2.0]])
+    cache.get_many(["a"])
+    cache.put_many(["c"], [[3.0]])
+
+    assert list(cache._lru) == [EmbeddingCache._key("a"), EmbeddingCache._key("c")]
+    # Evicted entries are still served from disk
+    assert cache.get_many(["b"]) == [[2.0]]
+
+
+def test_vectors_are_stored_as_8_bit_levels(tmp_path):
+    db_path = tmp_path / "cache.sqlite3"
+    EmbeddingCache(db_path, "model-a").put_many(["alpha"], [[0.1234567, -0.5, 0.75]])
+
+    cache = EmbeddingCache(db_path, "model-a")
+    (blob,) = cache._connection().execute(f"SELECT vector FROM {EmbeddingCache.TABLE}").fetchone()
+    assert len(blob) == EmbeddingCache._HEADER.size + 3
+    assert cache.get_many(["alpha"])[0] == pytest.approx([0.1234567, -0.5, 0.75], abs=(1.25 / 255) / 2)
+
+
+@pytest.mark.parametrize("table, value_format", [("embeddings", "f"), ("embeddings_f16", "e")])
+def test_legacy_tables_are_migrated(tmp_path, table, value_format):
+    import sqlite3
+    import struct
+
+    db_path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(f"CREATE TABLE {table} (text_hash BLOB, model TEXT, vector BLOB, PRIMARY KEY (text_hash, model))")
+    conn.execute(
+        f"INSERT INTO {table} VALUES (?, ?, ?)",
+        (EmbeddingCache._key("alpha"), "model-a", struct.pack(f"<2{value_format}", 0.5, -2.0))
+    )
+    conn.commit()
+    conn.close()
+
+    cache = EmbeddingCache(db_path, "model-a")
+
+    assert cache.get_many(["alpha"])[0] == pytest.approx([0.5, -2.0])
+    tables = {name for (name,) in cache._connection().execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert table not in tables
+
+
+def test_memory_entries_are_compact_float32(tmp_path):
+    import numpy as np
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", "model-a")
+    cache.put_many(["chunk"], [[0.25, -0.5, 1.0]])
+
+    (stored,) = cache._lru.values()
+    assert isinstance(stored, np.ndarray) and stored.dtype == np.float32
+    assert cache.get_many(["chunk"]) == [[0.25, -0.5, 1.0]]
@@ -0,0 +1,241 @@
+# tests/test_file_manager.py
+#
+# Tests for RAG FileManager (local storage mode, no HF Hub).
+#
+
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.rag import file_manager as fm_module
+from app.rag.file_manager import FileManager
+
+
+@pytest.fixture
+def mock_vectorstore_manager():
+    # Fake vectorstore manager injected in place of app.rag.vectorstore_manager
+    manager = MagicMock()
+    manager.add_documents.return_value = 1
+    fake_module = MagicMock()
+    fake_module.get_vectorstore_manager.return_value = manager
+    with patch.dict(sys.modules, {"app.rag.vectorstore_manager": fake_module}):
+        yield manager
+
+
+@pytest.fixture
+def file_manager(tmp_path, monkeypatch):
+    # FileManager on a temporary storage dir, local filesystem only
+    monkeypatch.setattr(fm_module, "HF_PERSISTENCE_AVAILABLE", False)
+    storage_dir = tmp_path / "storage"
+    return FileManager(storage_dir=storage_dir)
+
+
+def _write(path, data: bytes):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_save_text_file_is_embedded(file_manager, mock_vectorstore_manager, tmp_path):
+    source = _write(tmp_path / "notes.txt", b"Team context document")
+
+    result = file_manager.save_uploaded_file(source)
+
+    assert result["stored_name"].startswith("notes_")
+    assert len(file_manager.get_files()) == 1
+    mock_vectorstore_manager.add_documents.assert_called_once()
+
+
+def test_save_empty_file_skips_embedding(file_manager, mock_vectorstore_manager, tmp_path):
+    source = _write(tmp_path / "empty.txt", b"")
+
+    file_manager.save_uploaded_file(source)
+
+    assert len(file_manager.get_files()) == 1
+    mock_vectorstore_manager.add_documents.assert_not_called()
+
+
+def test_save_binary_file_skips_embedding(file_manager, mock_vectorstore_manager, tmp_path):
+    source = _write(tmp_path / "image.txt", b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+
+    file_manager.save_uploaded_file(source)
+
+    assert len(file_manager.get_files()) == 1
+    mock_vectorstore_manager.add_documents.assert_not_called()
+
+
+def test_save_missing_file_raises(file_manager, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        file_manager.save_uploaded_file(str(tmp_path / "missing.txt"))
+
+
+def test_save_duplicate_content_skips_embedding(file_manager, mock_vectorstore_manager, tmp_path):
+    first = _write(tmp_path / "policy_v1.txt", b"Remote work policy")
+    second = _write(tmp_path / "policy_copy.txt", b"Remote work policy")
+
+    first_result = file_manager.save_uploaded_file(first)
+    file_manager.save_uploaded_file(second)
+
+    files = file_manager.get_files()
+    assert len(files) == 2
+    assert files[1].duplicate_of == first_result["stored_name"]
+    mock_vectorstore_manager.add_documents.assert_called_once()
+
+
+def test_save_uploaded_files_embeds_in_one_batch(file_manager, mock_vectorstore_manager, tmp_path):
+    paths = [
+        _write(tmp_path / "a.txt", b"First document"),
+        _write(tmp_path / "b.txt", b"Second document"),
+        str(tmp_path / "missing.txt"),
+    ]
+
+    saved, failed = file_manager.save_uploaded_files(paths)
+
+    assert len(saved) == 2
+    assert [path for path, _ in failed] == [paths[2]]
+    mock_vectorstore_manager.add_documents.assert_called_once()
+    documents, metadatas = mock_vectorstore_manager.add_documents.call_args.args
+    assert documents == ["First document", "Second document"]
+    assert [m["original_name"] for m in metadatas] == ["a.txt", "b.txt"]
+
+
+def test_refresh_state_lists_files_newest_first(file_manager):
+    import os
+    storage_dir = file_manager.storage_dir
+    (storage_dir / ".gitkeep").write_text("")
+    (storage_dir / "old.txt").write_text("old")
+    (storage_dir / "new.txt").write_text("new")
+    (storage_dir / "subdir").mkdir()
+    os.utime(storage_dir / "old.txt", (1_000_000, 1_000_000))
+
+    files = file_manager.refresh_state()
+
+    assert [f.name for f in files] == ["new.txt", "old.txt"]
+    assert files[0].size == 3
+
+
+def test_render_files_text_and_storage_info(file_manager, mock_vectorstore_manager, tmp_path):
+    file_manager.save_uploaded_file(_write(tmp_path / "report.txt", b"x" * 2048))
+
+    assert "(2.0 KB)" in file_manager.render_files_text()
+    assert file_manager.get_storage_info()["total_size_bytes"] == 2048
+
+
+def test_render_files_text_is_refreshed_after_upload(file_manager, mock_vectorstore_manager, tmp_path):
+    assert file_manager.render_files_text() == "📂 No files uploaded yet"
+
+    file_manager.save_uploaded_file(_write(tmp_path / "a.txt", b"First document"))
+    first = file_manager.render_files_text()
+    file_manager.save_uploaded_file(_write(tmp_path / "b.txt", b"Second document"))
+
+    assert "a_" in first and "b_" not in first
+    assert "b_" in file_manager.render_files_text()
+    assert file_manager.get_storage_info()["file_count"] == 2
+
+
+def test_sync_embeddings_reads_all_files_then_embeds_once(file_manager, monkeypatch):
+    manager = MagicMock()
+    manager.add_documents.return_value = 2
+    monkeypatch.setattr(fm_module, "get_vectorstore_manager", lambda: manager, raising=False)
+    storage_dir = file_manager.storage_dir
+    (storage_dir / "a.txt").write_text("First document")
+    (storage_dir / "b.txt").write_text("")
+    (storage_dir / "c.txt").write_text("Third document")
+    files = file_manager.refresh_state()
+
+    file_manager._sync_embeddings(files)
+
+    manager.add_documents.assert_called_once()
+    documents = manager.add_documents.call_args.kwargs["documents"]
+    assert sorted(documents) == ["First document", "Third document"]
+
+
+def test_sync_embeddings_downloads_missing_files_in_parallel(file_manager, monkeypatch):
+    # Full-sync path (sync_files_to_vectorstore); not part of app startup
+    import threading
+    from app.rag.file_manager import FileEntry
+    manager = MagicMock()
+    manager.add_documents.return_value = 3
+    monkeypatch.setattr(fm_module, "get_vectorstore_manager", lambda: manager, raising=False)
+    threads = set()
+
+    def download(name, path):
+        threads.add(threading.current_thread().name)
+        with open(path, "w") as f:
+            f.write(f"Content of {name}")
+        return True
+
+    file_manager.hf_persistence = MagicMock()
+    file_manager.hf_persistence.download_document.side_effect = download
+    files = [FileEntry(name=f"doc{i}.txt", path="", size=0, modified="N/A", timestamp=0) for i in range(3)]
+
+    file_manager._sync_embeddings(files)
+
+    assert file_manager.hf_persistence.download_document.call_count == 3
+    assert threading.current_thread().name not in threads
+    manager.add_documents.assert_called_once()
+    documents = manager.add_documents.call_args.kwargs["documents"]
+    assert documents == [f"Content of doc{i}.txt" for i in range(3)]
+
+
+def test_read_all_contents_returns_stored_text(file_manager, mock_vectorstore_manager, tmp_path):
+    file_manager.save_uploaded_file(_write(tmp_path / "notes.txt", b"Team context document"))
+    file_manager.save_uploaded_file(_write(tmp_path / "blank.txt", b"   "))
+
+    assert file_manager.read_all_contents() == ["Team context document"]
+
+
+def test_save_uploaded_files_saves_registry_once_per_batch(file_manager, mock_vectorstore_manager, tmp_path):
+    pytest.importorskip("huggingface_hub")
+    from app.rag.hf_persistence import HFPersistence
+    persistence = HFPersistence()
+    persistence._set_registry_cache([])
+    persistence.save_registry = MagicMock(return_value=True)
+    file_manager.hf_persistence = persistence
+    paths = [
+        _write(tmp_path / "a.txt", b"First document"),
+        _write(tmp_path / "b.txt", b"Second document"),
+    ]
+
+    file_manager.save_uploaded_files(paths)
+
+    persistence.save_registry.assert_called_once()
+    saved_registry = persistence.save_registry.call_args.args[0]
+    assert [doc["filename"][:2] for doc in saved_registry] == ["a_", "b_"]
+
+
+def test_render_is_not_cached_if_files_change_while_rendering(file_manager, mock_vectorstore_manager, tmp_path):
+    file_manager.save_uploaded_file(_write(tmp_path / "a.txt", b"First document"))
+
+    class ChangingList(list):
+        # Simulates an upload landing while the list is being rendered
+        def __iter__(self):
+            file_manager._invalidate_render_cache()
+            return super().__iter__()
+
+    file_manager._files = ChangingList(file_manager._files)
+    file_manager._invalidate_render_cache()
+
+    assert "a_" in file_manager.render_files_text()
+    assert file_manager._render_cache is None
+    assert file_manager.get_storage_info()["file_count"] == 1
+    assert file_manager._storage_info_cache is None
+
+
+def test_file_manager_singleton_is_created_once_under_concurrency(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    created = []
+
+    class SlowFileManager:
+        def __init__(self):
+            created.append(threading.current_thread().name)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(fm_module, "FileManager", SlowFileManager)
+    monkeypatch.setattr(fm_module, "_file_manager_instance", None)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        managers = list(executor.map(lambda _: fm_module.get_file_manager(), range(4)))
+
+    assert len(created) == 1
+    assert all(manager is managers[0] for manager in managers)
@@ -0,0 +1,59 @@
+# tests/test_hf_persistence.py
+#
+# Tests for the in-memory RAG registry of HFPersistence (no HF Hub calls).
+#
+
+import pytest
+
+pytest.importorskip("huggingface_hub")
+
+from app.rag.hf_persistence import HFPersistence
+
+
+@pytest.fixture
+def persistence():
+    # Fresh instance with an already loaded (empty) registry cache
+    instance = HFPersistence()
+    instance._set_registry_cache([])
+    return instance
+
+
+def test_add_documents_bulk_skips_known_filenames(persistence):
+    persistence._set_registry_cache([{"filename": "a.txt", "source": "/a.txt"}])
+
+    added = persistence.add_documents_bulk([
+        ("a.txt", "/a.txt"),
+        ("b.txt", "/b.txt"),
+        ("b.txt", "/b.txt"),
+    ])
+
+    assert added == 1
+    assert [doc["filename"] for doc in persistence.load_registry()] == ["a.txt", "b.txt"]
+    assert persistence._registry_dirty
+
+
+def test_flush_registry_without_changes_does_not_upload(persistence, monkeypatch):
+    monkeypatch.setattr(persistence, "save_registry", lambda registry: pytest.fail("unexpected upload"))
+
+    assert persistence.flush_registry() is True
+
+
+def test_upload_vectorstore_uploads_non_empty_dir_once(persistence, tmp_path, monkeypatch):
+    from unittest.mock import MagicMock
+    chroma_dir = tmp_path / "chroma_db"
+    chroma_dir.mkdir()
+    (chroma_dir / "chroma.sqlite3").write_bytes(b"\0" * 4096)
+    monkeypatch.setattr(persistence, "CHROMA_DIR", chroma_dir)
+    persistence.api = MagicMock()
+
+    assert persistence.upload_vectorstore() is True
+    assert persistence.upload_vectorstore() is True
+
+    persistence.api.upload_folder.assert_called_once()
+    assert persistence.api.upload_folder.call_args.kwargs["folder_path"] == str(chroma_dir)
+
+
+def test_upload_vectorstore_without_local_dir_fails(persistence, tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "CHROMA_DIR", tmp_path / "missing")
+
+    assert persistence.upload_vectorstore() is False
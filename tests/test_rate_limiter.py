@@ -0,0 +1,38 @@
+# tests/test_rate_limiter.py
+#
+# Tests for the embedding API rate limiter.
+#
+
+from app.rag import rate_limiter as rl_module
+from app.rag.rate_limiter import RateLimiter
+
+
+def test_acquire_waits_once_window_is_full(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(rl_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rl_module.time, "sleep", fake_sleep)
+    limiter = RateLimiter(max_requests=2, period=10.0)
+
+    limiter.acquire()
+    clock[0] += 4.0
+    limiter.acquire()
+    limiter.acquire()
+
+    assert sleeps == [6.0]
+
+
+def test_non_positive_limit_disables_limiting(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rl_module.time, "sleep", sleeps.append)
+    limiter = RateLimiter(max_requests=0)
+
+    for _ in range(100):
+        limiter.acquire()
+
+    assert sleeps == []
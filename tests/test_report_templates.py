@@ -56,6 +56,41 @@ class TestTemplateLoader:
         template2 = loader.load_template("report_full.html")
         
         assert template1 is template2  # Same object
+    
+    def test_render_matches_safe_substitute(self, tmp_path):
+        #
+        # Test that compiled rendering behaves like string.Template.safe_substitute
+        #
+        from app.report.template_loader import TemplateLoader
+        
+        (tmp_path / "t.html").write_text("<p>$name ${braced}x costs $$5 $ $missing</p>", encoding="utf-8")
+        loader = TemplateLoader(templates_dir=str(tmp_path))
+        context = {"name": "Ada", "braced": 1}
+        
+        rendered = loader.render("t.html", context)
+        
+        assert rendered == "<p>Ada 1x costs $5 $ $missing</p>"
+        assert rendered == loader.load_template("t.html").safe_substitute(context)
+    
+    def test_cache_evicts_least_recently_used_beyond_byte_budget(self, tmp_path, monkeypatch):
+        #
+        # Test that the template cache stays within MAX_CACHE_BYTES
+        #
+        from app.report.template_loader import TemplateLoader
+        
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.html").write_text(name * 10, encoding="utf-8")
+        loader = TemplateLoader(templates_dir=str(tmp_path))
+        monkeypatch.setattr(loader, "MAX_CACHE_BYTES", 25)
+        
+        loader.render("a.html", {})
+        loader.render("b.html", {})
+        loader.render("a.html", {})
+        loader.render("c.html", {})
+        
+        assert list(loader._cache) == ["a.html", "c.html"]
+        assert loader._cache_bytes == 20
+        assert "b.html" not in loader._compiled
 
 
 class TestReportGeneration:
@@ -204,6 +239,18 @@ class TestMarkdownConversion:
         
         assert "style=" in html
         assert "color:" in html
+    
+    def test_markdown_bold_inside_headers_and_list_items(self):
+        #
+        # Test that bold is converted within headers and list items
+        #
+        text = "### Risk **high**\n- **Cost**: low\n\nPlain **end**"
+        html = markdown_to_html(text, inline_styles=False)
+        
+        assert html == (
+            "<h3>Risk <strong>high</strong></h3>\n"
+            "<ul><li><strong>Cost</strong>: low</li>\n</ul>Plain <strong>end</strong>"
+        )
 
 
 if __name__ == "__main__":
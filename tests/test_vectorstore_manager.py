@@ -0,0 +1,490 @@
+# tests/test_vectorstore_manager.py
+#
+# Tests for VectorstoreManager helpers (no OpenAI / HF Hub calls).
+#
+
+import pytest
+
+pytest.importorskip("langchain_chroma")
+
+from app.rag.vectorstore_manager import VectorstoreManager, get_embeddings
+
+
+@pytest.fixture
+def manager():
+    # Bare instance: chunking helpers don't need embeddings or Chroma
+    return VectorstoreManager.__new__(VectorstoreManager)
+
+
+def test_chunk_text_overlapping_windows(manager):
+    text = "abcdefghij"
+
+    chunks = manager._chunk_text(text, chunk_size=4, overlap=2)
+
+    assert chunks == ["abcd", "cdef", "efgh", "ghij", "ij"]
+
+
+def test_chunk_text_empty(manager):
+    assert manager._chunk_text("") == []
+
+
+def test_chunk_text_rejects_overlap_not_smaller_than_size(manager):
+    with pytest.raises(ValueError):
+        manager._chunk_text("abc", chunk_size=3, overlap=3)
+
+
+
+def test_split_text_respects_chunk_size(manager, monkeypatch):
+    monkeypatch.setattr(VectorstoreManager, "CHUNK_SIZE", 50)
+    monkeypatch.setattr(VectorstoreManager, "CHUNK_OVERLAP", 10)
+    manager._splitter = None
+    text = "\n\n".join(f"Paragraph {i} about the remote work policy." for i in range(20))
+
+    chunks = manager._split_text(text)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 50 for chunk in chunks)
+
+@pytest.fixture
+def offline_manager(tmp_path):
+    # Full instance with embeddings and HF persistence mocked out
+    from unittest.mock import patch
+    get_embeddings.cache_clear()
+    with patch("app.rag.vectorstore_manager.OpenAIEmbeddings"), \
+         patch("app.rag.vectorstore_manager.get_hf_persistence"):
+        manager = VectorstoreManager()
+        manager.embedding_cache_path = tmp_path / "embedding_cache.sqlite3"
+        yield manager
+
+
+def test_hub_syncs_are_coalesced_until_flush(offline_manager):
+    from unittest.mock import patch
+    with patch.object(offline_manager, "_sync_to_hub") as sync:
+        offline_manager._schedule_sync()
+        offline_manager._schedule_sync()
+
+        # The upload runs in the background but is not dropped at interpreter exit
+        assert offline_manager._sync_timer.daemon is False
+        assert offline_manager.flush() is True
+        assert offline_manager.flush() is False
+
+    sync.assert_called_once()
+
+
+def _fake_embeddings(manager):
+    # Deterministic fake vectors: one per text, tagged with the text itself
+    manager.embeddings.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+
+
+def test_add_documents_skips_already_embedded_chunks(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+
+    first = offline_manager.add_documents(["same text"], [{"filename": "a.txt"}])
+    second = offline_manager.add_documents(["same text"], [{"filename": "b.txt"}])
+
+    assert first == 1
+    assert second == 0
+    offline_manager._vectorstore._collection.upsert.assert_called_once()
+
+
+def test_add_documents_embeds_in_ordered_batches(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    monkeypatch.setattr(offline_manager, "EMBED_BATCH_SIZE", 2)
+    monkeypatch.setattr(offline_manager, "ADD_BATCH_SIZE", 2)
+
+    added = offline_manager.add_documents(["a", "bb", "ccc"])
+
+    assert added == 3
+    assert offline_manager.embeddings.embed_documents.call_count == 2
+    calls = offline_manager._vectorstore._collection.upsert.call_args_list
+    assert [c.kwargs["documents"] for c in calls] == [["a", "bb"], ["ccc"]]
+    assert [[list(v) for v in c.kwargs["embeddings"]] for c in calls] == [[[1.0], [2.0]], [[3.0]]]
+
+
+def test_embed_batch_retries_when_rate_limited(offline_manager, monkeypatch):
+    monkeypatch.setattr(offline_manager, "EMBED_RETRY_BASE_SECONDS", 0)
+    offline_manager.embeddings.embed_documents.side_effect = [
+        Exception("Error code: 429 - rate limit exceeded"),
+        [[1.0]],
+    ]
+
+    assert offline_manager._request_embeddings(["a"]) == [[1.0]]
+    assert offline_manager.embeddings.embed_documents.call_count == 2
+
+
+def test_embed_batch_does_not_retry_other_errors(offline_manager):
+    offline_manager.embeddings.embed_documents.side_effect = ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        offline_manager._request_embeddings(["a"])
+    assert offline_manager.embeddings.embed_documents.call_count == 1
+
+
+def test_embed_batch_requests_only_cache_misses(offline_manager):
+    _fake_embeddings(offline_manager)
+    offline_manager._embed_batch(["a", "bb"])
+
+    vectors = offline_manager._embed_batch(["bb", "ccc", "a"])
+
+    assert vectors == [[2.0], [3.0], [1.0]]
+    assert offline_manager.embeddings.embed_documents.call_args.args == (["ccc"],)
+
+
+def test_add_documents_embeds_repeated_chunks_once_per_batch(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+
+    added = offline_manager.add_documents(["Confidential footer", "Confidential footer", "Body"])
+
+    assert added == 2
+    offline_manager.embeddings.embed_documents.assert_called_once_with(["Confidential footer", "Body"])
+
+
+def test_add_documents_falls_back_to_add_texts(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    monkeypatch.setattr(offline_manager, "DIRECT_COLLECTION_ADD", False)
+
+    assert offline_manager.add_documents(["text"]) == 1
+
+    offline_manager._vectorstore.add_texts.assert_called_once()
+    offline_manager._vectorstore._collection.upsert.assert_not_called()
+    offline_manager.embeddings.embed_documents.assert_not_called()
+
+
+def test_get_embeddings_is_shared_per_model():
+    from unittest.mock import patch
+    get_embeddings.cache_clear()
+    with patch("app.rag.vectorstore_manager.OpenAIEmbeddings") as embeddings_cls:
+        assert get_embeddings() is get_embeddings()
+        get_embeddings("text-embedding-3-small")
+        get_embeddings("text-embedding-3-small")
+    get_embeddings.cache_clear()
+
+    assert embeddings_cls.call_count == 2
+    assert embeddings_cls.call_args.kwargs == {"model": "text-embedding-3-small"}
+
+
+def test_count_uses_local_collection(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    offline_manager._vectorstore._collection.count.return_value = 3
+
+    assert offline_manager.count() == 3
+    offline_manager.embeddings.embed_query.assert_not_called()
+
+
+def test_clear_resets_collection_in_place(offline_manager):
+    from unittest.mock import MagicMock
+    vectorstore = MagicMock()
+    offline_manager._vectorstore = vectorstore
+    offline_manager._chunk_hashes.add("abc")
+
+    offline_manager.clear()
+
+    vectorstore.reset_collection.assert_called_once()
+    vectorstore._collection.get.assert_not_called()
+    assert offline_manager._vectorstore is vectorstore
+    assert not offline_manager._chunk_hashes
+
+
+def test_splitter_is_built_once(offline_manager):
+    splitter = offline_manager.splitter
+    if splitter is None:
+        pytest.skip("no text splitter library installed")
+
+    offline_manager._split_text("First paragraph.\n\nSecond paragraph.")
+    offline_manager._split_text("Another document.")
+
+    assert offline_manager.splitter is splitter
+
+
+def test_embedding_matrix_is_contiguous_float32():
+    np = pytest.importorskip("numpy")
+
+    matrix = VectorstoreManager._embedding_matrix([[1.0, 2.0], [3.0, 4.0]])
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (2, 2)
+    assert matrix.flags["C_CONTIGUOUS"]
+
+
+def test_chunk_metadata_carries_document_and_chunk_fields(offline_manager, monkeypatch):
+    monkeypatch.setattr(offline_manager, "_split_text", lambda text: text.split("|"))
+    produced = []
+
+    batches = list(offline_manager._new_chunk_batches(["a|b", "c"], [{"filename": "x"}, {"filename": "y"}], produced))
+
+    assert [m["chunk_id"] for m in produced] == [1, 2, 1]
+    assert [m["total_chunks"] for m in produced] == [2, 2, 1]
+    assert [m["doc_index"] for m in produced] == [0, 0, 1]
+    assert [m["filename"] for m in produced] == ["x", "x", "y"]
+    assert batches[0][1] == produced
+
+
+def test_embedding_batches_are_coalesced_into_larger_inserts(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    monkeypatch.setattr(offline_manager, "EMBED_BATCH_SIZE", 1)
+    monkeypatch.setattr(offline_manager, "ADD_BATCH_SIZE", 2)
+
+    added = offline_manager.add_documents(["a", "bb", "ccc"])
+
+    assert added == 3
+    assert offline_manager.embeddings.embed_documents.call_count == 3
+    calls = offline_manager._vectorstore._collection.upsert.call_args_list
+    assert [c.kwargs["documents"] for c in calls] == [["a", "bb"], ["ccc"]]
+
+
+def test_single_short_document_is_embedded_without_thread_pool(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    monkeypatch.setattr(offline_manager, "_embed_batches", MagicMock(side_effect=AssertionError("pool used")))
+
+    added = offline_manager.add_documents(["short note"])
+
+    assert added == 1
+    offline_manager._vectorstore._collection.upsert.assert_called_once()
+
+
+def test_chunk_ids_are_content_hashes(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+
+    offline_manager.add_documents(["same text"])
+
+    call = offline_manager._vectorstore._collection.upsert.call_args
+    assert call.kwargs["ids"] == [m["content_hash"] for m in call.kwargs["metadatas"]]
+
+
+def test_reindex_after_restart_is_served_from_embedding_cache(offline_manager, tmp_path):
+    from unittest.mock import MagicMock, patch
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    offline_manager.embeddings.model = "text-embedding-3-small"
+    offline_manager.add_documents(["policy text"])
+
+    # New process, empty collection, same on-disk cache
+    with patch("app.rag.vectorstore_manager.OpenAIEmbeddings"), \
+         patch("app.rag.vectorstore_manager.get_hf_persistence"):
+        get_embeddings.cache_clear()
+        restarted = VectorstoreManager()
+        restarted.embedding_cache_path = offline_manager.embedding_cache_path
+        restarted.embeddings.model = "text-embedding-3-small"
+        restarted._vectorstore = MagicMock()
+
+        added = restarted.add_documents(["policy text"])
+
+    assert added == 1
+    restarted.embeddings.embed_documents.assert_not_called()
+    assert restarted._vectorstore._collection.upsert.call_args.kwargs["documents"] == ["policy text"]
+
+
+def test_rate_limited_retry_honors_retry_after(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    from app.rag import vectorstore_manager as vm_module
+    sleeps = []
+    monkeypatch.setattr(vm_module.time, "sleep", sleeps.append)
+    monkeypatch.setattr(offline_manager, "EMBED_RETRY_BASE_SECONDS", 0)
+    error = Exception("Error code: 429")
+    error.response = MagicMock(headers={"retry-after": "2.5"})
+    offline_manager.embeddings.embed_documents.side_effect = [error, [[1.0]]]
+
+    assert offline_manager._request_embeddings(["a"]) == [[1.0]]
+    assert sleeps == [2.5]
+
+
+def test_unchanged_documents_are_not_split_again(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    split_calls = []
+    monkeypatch.setattr(offline_manager, "_split_text", lambda text: split_calls.append(text) or [text])
+
+    offline_manager.add_documents(["doc one"])
+    added = offline_manager.add_documents(["doc one", "doc two"])
+
+    assert added == 1
+    assert split_calls == ["doc one", "doc two"]
+
+
+def test_doc_hashes_are_restored_from_metadata(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    offline_manager._vectorstore.get.return_value = {
+        "metadatas": [{"content_hash": "c1", "doc_hash": "d1"}, {"content_hash": "c2"}, None]
+    }
+
+    offline_manager._load_chunk_hashes(offline_manager._vectorstore)
+
+    assert offline_manager._chunk_hashes == {"c1", "c2"}
+    assert offline_manager._doc_hashes == {"d1"}
+
+
+def test_mmr_select_prefers_diverse_candidates():
+    pytest.importorskip("numpy")
+    query = [1.0, 0.0]
+    vectors = [[1.0, 0.0], [0.99, 0.01], [0.7, 0.7]]
+
+    assert VectorstoreManager._mmr_select(query, vectors, 2, lambda_mult=0.3) == [0, 2]
+    assert VectorstoreManager._mmr_select(query, vectors, 2, lambda_mult=1.0) == [0, 1]
+
+
+def test_similarity_search_reranks_fetched_candidates(offline_manager):
+    pytest.importorskip("numpy")
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    offline_manager.embeddings.embed_query.return_value = [1.0, 0.0]
+    offline_manager._vectorstore._collection.query.return_value = {
+        "documents": [["a", "a copy", "b"]],
+        "metadatas": [[{"chunk_id": 1}, None, {"chunk_id": 3}]],
+        "embeddings": [[[1.0, 0.0], [0.99, 0.01], [0.7, 0.7]]],
+        "distances": [[0.0, 0.01, 0.6]],
+    }
+
+    docs = offline_manager.similarity_search("query", k=2, fetch_k=3, lambda_mult=0.3)
+
+    assert [d.page_content for d in docs] == ["a", "b"]
+    assert offline_manager._vectorstore._collection.query.call_args.kwargs["n_results"] == 3
+    offline_manager._vectorstore.similarity_search.assert_not_called()
+
+
+def test_collection_is_opened_with_hnsw_settings(offline_manager):
+    from unittest.mock import patch
+    with patch("app.rag.vectorstore_manager.Chroma") as chroma:
+        offline_manager._open_chroma()
+
+    metadata = chroma.call_args.kwargs["collection_metadata"]
+    assert metadata["hnsw:space"] == "l2"
+    assert metadata["hnsw:M"] == VectorstoreManager.COLLECTION_METADATA["hnsw:M"]
+
+
+def test_inserts_never_exceed_add_batch_size(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    _fake_embeddings(offline_manager)
+    monkeypatch.setattr(offline_manager, "EMBED_BATCH_SIZE", 3)
+    monkeypatch.setattr(offline_manager, "ADD_BATCH_SIZE", 2)
+
+    added = offline_manager.add_documents(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert added == 5
+    calls = offline_manager._vectorstore._collection.upsert.call_args_list
+    assert [c.kwargs["documents"] for c in calls] == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+def test_empty_separator_is_the_last_fallback():
+    separators = VectorstoreManager.CHUNK_SEPARATORS
+
+    assert separators[-1] == ""
+    assert "" not in separators[:-1]
+    assert separators.index(" ") > separators.index(". ")
+
+
+def test_documents_are_split_in_parallel_in_order(offline_manager, monkeypatch):
+    import threading
+    threads = set()
+
+    def split(text):
+        threads.add(threading.current_thread().name)
+        return [text]
+
+    monkeypatch.setattr(offline_manager, "SPLIT_WORKERS", 4)
+    monkeypatch.setattr(offline_manager, "_split_text", split)
+    documents = [f"doc {i}" for i in range(20)]
+
+    assert list(offline_manager._split_documents(documents)) == [[doc] for doc in documents]
+    assert all(name.startswith("vectorstore_split") for name in threads)
+
+
+def test_concurrent_first_access_initializes_once(offline_manager, monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    calls = []
+
+    def initialize():
+        calls.append(threading.current_thread().name)
+        time.sleep(0.05)
+        offline_manager._vectorstore = object()
+
+    monkeypatch.setattr(offline_manager, "_initialize_vectorstore", initialize)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        stores = list(executor.map(lambda _: offline_manager.get_vectorstore(), range(4)))
+
+    assert len(calls) == 1
+    assert all(store is stores[0] for store in stores)
+
+
+def test_similarity_search_with_score_keeps_distances_of_selected(offline_manager):
+    pytest.importorskip("numpy")
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+    offline_manager.embeddings.embed_query.return_value = [1.0, 0.0]
+    offline_manager._vectorstore._collection.query.return_value = {
+        "documents": [["a", "a copy", "b"]],
+        "metadatas": [[{"chunk_id": 1}, None, {"chunk_id": 3}]],
+        "embeddings": [[[1.0, 0.0], [0.99, 0.01], [0.7, 0.7]]],
+        "distances": [[0.0, 0.01, 0.6]],
+    }
+
+    results = offline_manager.similarity_search_with_score("query", k=2, fetch_k=3, lambda_mult=0.3)
+
+    assert [(doc.page_content, score) for doc, score in results] == [("a", 0.0), ("b", 0.6)]
+    offline_manager._vectorstore.similarity_search_with_score.assert_not_called()
+
+
+def test_similarity_search_with_score_without_fetch_k_is_plain_top_k(offline_manager):
+    from unittest.mock import MagicMock
+    offline_manager._vectorstore = MagicMock()
+
+    offline_manager.similarity_search_with_score("query", k=5)
+
+    offline_manager._vectorstore.similarity_search_with_score.assert_called_once_with("query", k=5)
+    offline_manager._vectorstore._collection.query.assert_not_called()
+
+
+def test_vectorstore_is_published_after_hashes_are_loaded(offline_manager, monkeypatch):
+    from unittest.mock import MagicMock
+    chroma = MagicMock()
+    seen = []
+
+    def get(**kwargs):
+        seen.append(offline_manager._vectorstore)
+        return {"metadatas": [{"content_hash": "c1", "doc_hash": "d1"}]}
+
+    chroma.get.side_effect = get
+    monkeypatch.setattr(offline_manager, "_open_chroma", lambda: chroma)
+
+    assert offline_manager.get_vectorstore() is chroma
+    assert seen == [None]
+    assert offline_manager._chunk_hashes == {"c1"}
+
+
+def test_manager_singleton_is_created_once_under_concurrency(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.rag import vectorstore_manager as module
+    created = []
+
+    class SlowManager:
+        def __init__(self):
+            created.append(threading.current_thread().name)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(module, "VectorstoreManager", SlowManager)
+    monkeypatch.setattr(module, "_vectorstore_instance", None)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        managers = list(executor.map(lambda _: module.get_vectorstore_manager(), range(4)))
+
+    assert len(created) == 1
+    assert all(manager is managers[0] for manager in managers)